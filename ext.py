@@ -4,22 +4,37 @@ Streamlit commute dashboard with embedded external resources.
 """
 
 import json
+import math
+import string
+import time as _time
 import requests
-from datetime import datetime, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
 from typing import List, Tuple, Optional
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from zoneinfo import ZoneInfo
 
+import altair as alt
+import numpy as np
+import pandas as pd
 import streamlit as st
-import weather
-from movie_picker import movie_spotlight
-import fingrid_prices
+
+# weather, fingrid_prices and movie_picker are imported inside their
+# renderers so a cold start only pays for the sections actually reached.
 
 # Constants
 TZ = ZoneInfo("Europe/Helsinki")
 MORNING_PEAK_START = time(6, 0)
 MORNING_PEAK_END = time(14, 0)
 
+# Seconds a session reuses its last commute weather check
+WEATHER_ALERT_MAX_AGE = 600
+
+# Price/temperature axis half-ranges are rounded up to these steps, so the
+# cached chart templates are keyed on a handful of stable domains
+PRICE_AXIS_STEP = 5   # c/kWh
+TEMP_AXIS_STEP = 5    # °C
+
 # Electricity Price Components (c / kWh)
 AI_TRANSFER = 5.58
 BI_BASE = 0.49
@@ -80,6 +95,87 @@ STYLES = """
 """
 
 
+# Train card (iframe board + click-to-speak overlay); filled by _train_card_html
+TRAIN_CARD_TEMPLATE = string.Template("""
+    <style>
+        .train-card {
+            border: 1px solid rgba(0, 0, 0, 0.08);
+            border-radius: 0.75rem;
+            overflow: hidden;
+            box-shadow: 0 4px 14px rgba(17, 24, 39, 0.08);
+            background: #ffffff;
+            height: 210px;
+            position: relative;
+        }
+        .train-card iframe {
+            width: 303%;
+            height: 640px;
+            transform: scale(0.33);
+            transform-origin: top left;
+            border: 0;
+        }
+        .voice-btn {
+            position: absolute;
+            inset: 0;
+            background: transparent;
+            border: none;
+            cursor: pointer;
+            z-index: 2;
+        }
+        .voice-btn:hover {
+            background: rgba(0, 0, 0, 0.02);
+        }
+    </style>
+
+    <div class="train-card">
+        <button class="voice-btn" data-dir="$dir_id"
+                aria-label="$aria"></button>
+
+        <iframe src="$iframe_url"
+                loading="lazy"></iframe>
+    </div>
+
+    <script>
+    (function() {
+        const announceText = $announce_text;
+
+        function speak(text) {
+            if (!text || !window.speechSynthesis) return;
+            window.speechSynthesis.cancel();
+
+            const utter = new SpeechSynthesisUtterance(text);
+
+            const setVoice = () => {
+                const voices = window.speechSynthesis.getVoices();
+                if (voices.length) {
+                    utter.voice =
+                        voices.find(v => v.lang.toLowerCase().startsWith('en-gb')) ||
+                        voices.find(v => v.lang.toLowerCase().startsWith('en')) ||
+                        voices[0];
+                }
+            };
+
+            if (window.speechSynthesis.getVoices().length)
+                setVoice();
+            else
+                window.speechSynthesis.onvoiceschanged = setVoice;
+
+            window.speechSynthesis.speak(utter);
+        }
+
+        const btn = document.querySelector('.voice-btn[data-dir="$dir_id"]');
+        if (btn && !btn.dataset.bound) {
+            btn.dataset.bound = "true";
+            btn.addEventListener('click', (e) => {
+                e.preventDefault();
+                speak(announceText);
+            });
+        }
+    })();
+    </script>
+""")
+
+
 def ensure_main_fragment(url: str) -> str:
     """Append view=main and #main for FMI pages."""
     if "ilmatieteenlaitos.fi" not in url:
@@ -117,7 +213,7 @@ def get_departure_info(direction: str) -> Tuple[Optional[str], Optional[str]]:
             dest = stations.get("origin", "AIN")
             origin_name = "Helsinki"
 
-        departures = get_trains(origin, dest)
+        departures = get_trains(origin, dest, limit=1)
         if not departures:
             return None, f"No departures from {origin_name}"
 
@@ -134,181 +230,83 @@ def get_departure_info(direction: str) -> Tuple[Optional[str], Optional[str]]:
         return None, str(exc)
 
 
-def render_train_departures() -> None:
-    """Render live train departure boards with voice announcements."""
-
-    # --- Fetch data ---
-    to_hki_text, to_hki_error = get_departure_info("to_helsinki")
-    from_hki_text, from_hki_error = get_departure_info("from_helsinki")
-
-    if to_hki_error:
-        st.warning(f"Ainola → Helsinki: {to_hki_error}")
-    if from_hki_error:
-        st.warning(f"Helsinki → Ainola: {from_hki_error}")
-
-    # --- Convert to JSON for JS ---
-    to_hki_js = json.dumps(to_hki_text or "")
-    from_hki_js = json.dumps(from_hki_text or "")
-
-    # --- Build left card ---
-    train_html_left = f"""
-    <style>
-        .train-card {{
-            border: 1px solid rgba(0, 0, 0, 0.08);
-            border-radius: 0.75rem;
-            overflow: hidden;
-            box-shadow: 0 4px 14px rgba(17, 24, 39, 0.08);
-            background: #ffffff;
-            height: 210px;
-            position: relative;
-        }}
-        .train-card iframe {{
-            width: 303%;
-            height: 640px;
-            transform: scale(0.33);
-            transform-origin: top left;
-            border: 0;
-        }}
-        .voice-btn {{
-            position: absolute;
-            inset: 0;
-            background: transparent;
-            border: none;
-            cursor: pointer;
-            z-index: 2;
-        }}
-        .voice-btn:hover {{
-            background: rgba(0, 0, 0, 0.02);
-        }}
-    </style>
-
-    <div class="train-card">
-        <button class="voice-btn" data-dir="to_hki"
-                aria-label="Hear next train from Ainola"></button>
-
-        <iframe src="https://junalahdot.fi/518952272?command=fs&id=219&dt=dep&lang=3&did=47&title=Ainola%20-%20Helsinki"
-                loading="lazy"></iframe>
-    </div>
-
-    <script>
-    (function() {{
-        const announceText = {to_hki_js};
-
-        function speak(text) {{
-            if (!text || !window.speechSynthesis) return;
-            window.speechSynthesis.cancel();
+def _train_card_html(iframe_url: str, announce_text: str, dir_id: str, aria: str) -> str:
+    """
+    Fill the shared train card template.
 
-            const utter = new SpeechSynthesisUtterance(text);
+    Args:
+        iframe_url: junalahdot.fi departure board URL
+        announce_text: JSON-encoded announcement (already a JS literal)
+        dir_id: data-dir value binding the button to its script
+        aria: accessible label for the voice button
+    """
+    return TRAIN_CARD_TEMPLATE.substitute(
+        iframe_url=iframe_url,
+        announce_text=announce_text,
+        dir_id=dir_id,
+        aria=aria,
+    )
 
-            const setVoice = () => {{
-                const voices = window.speechSynthesis.getVoices();
-                if (voices.length) {{
-                    utter.voice =
-                        voices.find(v => v.lang.toLowerCase().startsWith('en-gb')) ||
-                        voices.find(v => v.lang.toLowerCase().startsWith('en')) ||
-                        voices[0];
-                }}
-            }};
 
-            if (window.speechSynthesis.getVoices().length)
-                setVoice();
-            else
-                window.speechSynthesis.onvoiceschanged = setVoice;
+class DepartureLookupError(RuntimeError):
+    """A direction failed; args hold both (text, error) results, uncached."""
 
-            window.speechSynthesis.speak(utter);
-        }}
 
-        const btn = document.querySelector('.voice-btn[data-dir="to_hki"]');
-        if (btn && !btn.dataset.bound) {{
-            btn.dataset.bound = "true";
-            btn.addEventListener('click', (e) => {{
-                e.preventDefault();
-                speak(announceText);
-            }});
-        }}
-    }})();
-    </script>
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_departure_info() -> Tuple[Tuple[Optional[str], Optional[str]], Tuple[Optional[str], Optional[str]]]:
     """
+    Both directions' departure info, shared across sessions and reruns for 30 s.
 
-    # --- Build right card ---
-    train_html_right = f"""
-    <style>
-        .train-card {{
-            border: 1px solid rgba(0, 0, 0, 0.08);
-            border-radius: 0.75rem;
-            overflow: hidden;
-            box-shadow: 0 4px 14px rgba(17, 24, 39, 0.08);
-            background: #ffffff;
-            height: 210px;
-            position: relative;
-        }}
-        .train-card iframe {{
-            width: 303%;
-            height: 640px;
-            transform: scale(0.33);
-            transform-origin: top left;
-            border: 0;
-        }}
-        .voice-btn {{
-            position: absolute;
-            inset: 0;
-            background: transparent;
-            border: none;
-            cursor: pointer;
-            z-index: 2;
-        }}
-        .voice-btn:hover {{
-            background: rgba(0, 0, 0, 0.02);
-        }}
-    </style>
-
-    <div class="train-card">
-        <button class="voice-btn" data-dir="from_hki"
-                aria-label="Hear next train from Helsinki"></button>
-
-        <iframe src="https://junalahdot.fi/518952272?command=fs&id=47&dt=dep&lang=3&did=219&title=Helsinki%20-%20Ainola"
-                loading="lazy"></iframe>
-    </div>
+    Returns:
+        ((to_helsinki_text, None), (from_helsinki_text, None))
 
-    <script>
-    (function() {{
-        const announceText = {from_hki_js};
+    Raises:
+        DepartureLookupError if either direction failed, so the failure
+        isn't cached and the next run retries.
+    """
+    # Both directions are independent network calls, so fetch them together
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        to_hki_f = pool.submit(get_departure_info, "to_helsinki")
+        from_hki_f = pool.submit(get_departure_info, "from_helsinki")
+    to_hki, from_hki = to_hki_f.result(), from_hki_f.result()
+    if to_hki[1] or from_hki[1]:
+        raise DepartureLookupError(to_hki, from_hki)
+    return to_hki, from_hki
 
-        function speak(text) {{
-            if (!text || !window.speechSynthesis) return;
-            window.speechSynthesis.cancel();
 
-            const utter = new SpeechSynthesisUtterance(text);
+def render_train_departures() -> None:
+    """Render live train departure boards with voice announcements."""
 
-            const setVoice = () => {{
-                const voices = window.speechSynthesis.getVoices();
-                if (voices.length) {{
-                    utter.voice =
-                        voices.find(v => v.lang.toLowerCase().startsWith('en-gb')) ||
-                        voices.find(v => v.lang.toLowerCase().startsWith('en')) ||
-                        voices[0];
-                }}
-            }};
+    # --- Fetch data ---
+    try:
+        to_hki, from_hki = cached_departure_info()
+    except DepartureLookupError as exc:
+        # Show this run's partial results; errors are formatted below
+        to_hki, from_hki = exc.args
+    (to_hki_text, to_hki_error), (from_hki_text, from_hki_error) = to_hki, from_hki
 
-            if (window.speechSynthesis.getVoices().length)
-                setVoice();
-            else
-                window.speechSynthesis.onvoiceschanged = setVoice;
+    if to_hki_error:
+        st.warning(f"Ainola → Helsinki: {to_hki_error}")
+    if from_hki_error:
+        st.warning(f"Helsinki → Ainola: {from_hki_error}")
 
-            window.speechSynthesis.speak(utter);
-        }}
+    # --- Convert to JSON for JS ---
+    to_hki_js = json.dumps(to_hki_text or "")
+    from_hki_js = json.dumps(from_hki_text or "")
 
-        const btn = document.querySelector('.voice-btn[data-dir="from_hki"]');
-        if (btn && !btn.dataset.bound) {{
-            btn.dataset.bound = "true";
-            btn.addEventListener('click', (e) => {{
-                e.preventDefault();
-                speak(announceText);
-            }});
-        }}
-    }})();
-    </script>
-    """
+    # --- Build cards ---
+    train_html_left = _train_card_html(
+        "https://junalahdot.fi/518952272?command=fs&id=219&dt=dep&lang=3&did=47&title=Ainola%20-%20Helsinki",
+        to_hki_js,
+        "to_hki",
+        "Hear next train from Ainola",
+    )
+    train_html_right = _train_card_html(
+        "https://junalahdot.fi/518952272?command=fs&id=47&dt=dep&lang=3&did=219&title=Helsinki%20-%20Ainola",
+        from_hki_js,
+        "from_hki",
+        "Hear next train from Helsinki",
+    )
 
     # --- Render in two columns ---
     col1, col2 = st.columns(2)
@@ -345,13 +343,143 @@ def render_live_train_map() -> None:
 def render_weather_alert() -> None:
     """Display weather alert if conditions warrant attention."""
     try:
-        needs_attention, icon, details = weather.rough_weather_check()
+        # Weather moves on 10-minute scales; reuse this session's last check until then
+        entry = st.session_state.setdefault("weather_alert", {})
+        if entry and _time.time() - entry["t"] < WEATHER_ALERT_MAX_AGE:
+            needs_attention, icon, details = entry["result"]
+        else:
+            import weather
+
+            needs_attention, icon, details = weather.rough_weather_check()
+            entry.update(t=_time.time(), result=(needs_attention, icon, details))
         if needs_attention:
             st.markdown(f"### {icon} Commute weather alert")
             st.markdown(details)
     except Exception as e:
         st.warning(f"Could not check commute weather: {e}")
 
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _price_chart_templates(show_total: bool, p_domain: Tuple[float, float], t_domain: Tuple[float, float]):
+    """
+    Build the data-free Altair layers for the price chart.
+
+    Cached per view and (step-rounded) axis domains so reruns only attach fresh
+    data (via .properties(data=...)) instead of rebuilding the encodings.
+
+    Returns:
+        (price_chart, zero_line, temp_line, temp_points)
+    """
+    x_axis = alt.X('localTime:T',
+                   title=None,
+                   axis=alt.Axis(format='%H:%M', labelAngle=0, grid=False))
+    p_scale = alt.Scale(domain=list(p_domain))
+    t_scale = alt.Scale(domain=list(t_domain))
+
+    if not show_total:
+        # Single bar per slot for the Spot Price view
+        price_chart = alt.Chart().mark_bar(
+            stroke=None,
+            clip=True
+        ).encode(
+            x=x_axis,
+            x2='localEndTime:T',
+            y=alt.Y('value:Q', title='c / kWh', scale=p_scale),
+            y2=alt.datum(0),
+            color=alt.Color('color:N', scale=None),
+            tooltip=[
+                alt.Tooltip('localTime:T', title='Date/Time', format='%d.%m. %H:%M'),
+                alt.Tooltip('value:Q', title='Spot Price (c/kWh)', format='.2f'),
+                alt.Tooltip('Temperature:Q', title='Temp (°C)', format='.1f')
+            ]
+        )
+    else:
+        # Stacked components (Transfer Fee, Fixed Margin, Spot) for the Total Price view
+        price_chart = alt.Chart().mark_bar(
+            stroke=None,
+            clip=True
+        ).encode(
+            x=x_axis,
+            x2='localEndTime:T',
+            y=alt.Y('y_start:Q', title='c / kWh', scale=p_scale),
+            y2='y_end:Q',
+            color=alt.Color('color:N', scale=None),
+            tooltip=[
+                alt.Tooltip('localTime:T', title='Date/Time', format='%d.%m. %H:%M'),
+                alt.Tooltip('Total:Q', title='Total Price', format='.2f'),
+                alt.Tooltip('Component:N', title='Component'),
+                alt.Tooltip('y_start:Q', title='From', format='.2f'),
+                alt.Tooltip('y_end:Q', title='To', format='.2f'),
+                alt.Tooltip('Temperature:Q', title='Temp (°C)', format='.1f')
+            ]
+        )
+
+    # Zero Line for Price Axis
+    zero_line = alt.Chart(pd.DataFrame({'y': [0]})).mark_rule(
+        color='black',
+        strokeWidth=2
+    ).encode(y=alt.Y('y:Q', title=None, axis=None, scale=p_scale))
+
+    temp_tooltip = [
+        alt.Tooltip('time:T', title='Time', format='%H:%M'),
+        alt.Tooltip('temp:Q', title='Temp (°C)', format='.1f')
+    ]
+    temp_line = alt.Chart().mark_line(
+        color='#3498db',
+        strokeWidth=2.5,  # Thicker line
+        opacity=1.0,      # Fully opaque
+        interpolate='monotone'
+    ).encode(
+        x='time:T',
+        y=alt.Y('temp:Q', title='°C',
+                axis=alt.Axis(orient='right'),
+                scale=t_scale),
+        tooltip=temp_tooltip
+    )
+
+    # Add points to ensure we see individual data points
+    temp_points = alt.Chart().mark_circle(
+        color='#3498db',
+        size=30
+    ).encode(
+        x='time:T',
+        y=alt.Y('temp:Q', scale=t_scale),
+        tooltip=temp_tooltip
+    )
+
+    return price_chart, zero_line, temp_line, temp_points
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _midnight_line(date_key: date):
+    """Dashed rule at the start of tomorrow; keyed on today's date."""
+    tomorrow_start = datetime.combine(date_key, time(0), tzinfo=TZ) + timedelta(days=1)
+    return alt.Chart(pd.DataFrame({'x': [tomorrow_start]})).mark_rule(
+        color='white',
+        strokeDash=[5, 5],
+        strokeWidth=2
+    ).encode(
+        x='x:T'
+    )
+
+
+def _epoch_ns(times: pd.Series) -> np.ndarray:
+    """Tz-aware datetimes as int64 UTC nanoseconds, whatever resolution pandas parsed them at."""
+    return times.dt.tz_convert('UTC').astype('datetime64[ns, UTC]').astype('int64').to_numpy()
+
+
+def _nearest_sample(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    Value of fp at the xp nearest to each x (xp sorted ascending, ties go to the earlier sample).
+    Same result as merge_asof(direction='nearest'), without building a merged frame.
+    """
+    if len(xp) == 1:
+        return np.full(len(x), fp[0], dtype=float)
+    idx = np.searchsorted(xp, x).clip(1, len(xp) - 1)
+    # Step back to the left neighbour when it is at least as close
+    idx -= (x - xp[idx - 1]) <= (xp[idx] - x)
+    return fp[idx]
+
+
 def render_electricity_prices() -> None:
     """Display electricity prices for ±24 hours as a highly customized Altair chart with temperature."""
     st.markdown("### ⚡ Electricity Prices & Temperature (±24h)")
@@ -366,6 +494,9 @@ def render_electricity_prices() -> None:
     show_total = "Total Price" in price_view
     
     try:
+        import fingrid_prices
+        import weather
+
         # Fetch price data using sähkötin.fi logic (accurate spot prices)
         price_data = fingrid_prices.get_plus_minus_24h_prices()
         
@@ -381,7 +512,6 @@ def render_electricity_prices() -> None:
             return
 
         # Prepare for spot price text display (Now, +15, +30, +45, +60)
-        from datetime import datetime, timedelta
         now_helsinki = datetime.now(fingrid_prices.TZ)
         offsets = [0, 15, 30, 45, 60]
         spot_info = []
@@ -397,13 +527,10 @@ def render_electricity_prices() -> None:
         st.markdown(f"📍 **Spot Prices (c/kWh):** {' | '.join(spot_info)}")
         
         # Prepare DataFrames
-        import pandas as pd
-        import altair as alt
-        
         df_prices = pd.DataFrame(price_data)
         df_prices['localTime'] = pd.to_datetime(df_prices['localTime'])
         df_prices['localEndTime'] = pd.to_datetime(df_prices['localEndTime'])
-        now = datetime.now(fingrid_prices.TZ)
+        now = now_helsinki
         
         # 1. Add "Type" for color coding (Past/Future)
         df_prices['Period'] = df_prices['localTime'].apply(lambda x: 'Past' if x < now else 'Future')
@@ -422,18 +549,16 @@ def render_electricity_prices() -> None:
         else:
             df_temp = pd.DataFrame(columns=['time', 'temp'])
 
-        # Merge Price and Temp data for unified tooltips
-        df_prices = df_prices.sort_values('localTime')
+        # Nearest hourly temperature for each 15-min price slot, for unified tooltips
+        df_merged = df_prices.sort_values('localTime')
         if not df_temp.empty:
             df_temp_sorted = df_temp.sort_values('time')
-            df_merged = pd.merge_asof(
-                df_prices,
-                df_temp_sorted.rename(columns={'time': 'localTime', 'temp': 'Temperature'}),
-                on='localTime',
-                direction='nearest'
+            df_merged['Temperature'] = _nearest_sample(
+                _epoch_ns(df_merged['localTime']),
+                _epoch_ns(df_temp_sorted['time']),
+                df_temp_sorted['temp'].to_numpy(dtype=float),
             )
         else:
-            df_merged = df_prices.copy()
             df_merged['Temperature'] = None
 
         # 4. Use dynamic symmetric domains to align zero in the middle
@@ -444,11 +569,14 @@ def render_electricity_prices() -> None:
             p_vals = [v + offset for v in p_vals]
         
         p_max_abs = max([abs(v) for v in p_vals] + [1]) * 1.1
+        # Rounded up to a whole step: a stable cache key for _price_chart_templates
+        p_max_abs = math.ceil(p_max_abs / PRICE_AXIS_STEP) * PRICE_AXIS_STEP
         p_min_adj, p_max_adj = -p_max_abs, p_max_abs
 
         if not df_temp.empty:
             t_vals = df_temp['temp'].tolist()
             t_max_abs = max([abs(v) for v in t_vals] + [1]) * 1.1
+            t_max_abs = math.ceil(t_max_abs / TEMP_AXIS_STEP) * TEMP_AXIS_STEP
             t_min_adj, t_max_adj = -t_max_abs, t_max_abs
         else:
             t_min_adj, t_max_adj = -10, 10
@@ -472,26 +600,6 @@ def render_electricity_prices() -> None:
             
             # For the single bar view, we need a 'Component' for consistent encoding
             df_plot['Component'] = 'Spot Price'
-            
-            price_chart = alt.Chart(df_plot).mark_bar(
-                stroke=None,
-                clip=True
-            ).encode(
-                x=alt.X('localTime:T', 
-                        title=None,
-                        axis=alt.Axis(format='%H:%M', labelAngle=0, grid=False)),
-                x2='localEndTime:T',
-                y=alt.Y('value:Q', 
-                        title='c / kWh', 
-                        scale=alt.Scale(domain=[p_min_adj, p_max_adj])),
-                y2=alt.datum(0),
-                color=alt.Color('color:N', scale=None),
-                tooltip=[
-                    alt.Tooltip('localTime:T', title='Date/Time', format='%d.%m. %H:%M'),
-                    alt.Tooltip('value:Q', title='Spot Price (c/kWh)', format='.2f'),
-                    alt.Tooltip('Temperature:Q', title='Temp (°C)', format='.1f')
-                ]
-            )
         else:
             # Stacked bar view for Total Price
             # We need to melt the dataframe or create a long format
@@ -538,80 +646,22 @@ def render_electricity_prices() -> None:
                 })
             
             df_plot = pd.DataFrame(rows)
-            
-            price_chart = alt.Chart(df_plot).mark_bar(
-                stroke=None,
-                clip=True
-            ).encode(
-                x=alt.X('localTime:T', 
-                        title=None,
-                        axis=alt.Axis(format='%H:%M', labelAngle=0, grid=False)),
-                x2='localEndTime:T',
-                y=alt.Y('y_start:Q', 
-                        title='c / kWh', 
-                        scale=alt.Scale(domain=[p_min_adj, p_max_adj])),
-                y2='y_end:Q',
-                color=alt.Color('color:N', scale=None),
-                tooltip=[
-                    alt.Tooltip('localTime:T', title='Date/Time', format='%d.%m. %H:%M'),
-                    alt.Tooltip('Total:Q', title='Total Price', format='.2f'),
-                    alt.Tooltip('Component:N', title='Component'),
-                    alt.Tooltip('y_start:Q', title='From', format='.2f'),
-                    alt.Tooltip('y_end:Q', title='To', format='.2f'),
-                    alt.Tooltip('Temperature:Q', title='Temp (°C)', format='.1f')
-                ]
-            )
-        # Zero Line for Price Axis
-        zero_line = alt.Chart(pd.DataFrame({'y': [0]})).mark_rule(
-            color='black',
-            strokeWidth=2
-        ).encode(y=alt.Y('y:Q', title=None, axis=None, scale=alt.Scale(domain=[p_min_adj, p_max_adj])))
+
+        # Attach this run's data to the cached (data-free) layer templates
+        price_tpl, zero_line, temp_line_tpl, temp_points_tpl = _price_chart_templates(
+            show_total, (p_min_adj, p_max_adj), (t_min_adj, t_max_adj)
+        )
+        price_chart = price_tpl.properties(data=df_plot)
 
         # Temperature Chart (Right Axis)
         if not df_temp.empty:
-            temp_line = alt.Chart(df_temp).mark_line(
-                color='#3498db',
-                strokeWidth=2.5,  # Thicker line
-                opacity=1.0,      # Fully opaque
-                interpolate='monotone'
-            ).encode(
-                x='time:T',
-                y=alt.Y('temp:Q', title='°C', 
-                        axis=alt.Axis(orient='right'),
-                        scale=alt.Scale(domain=[t_min_adj, t_max_adj])),
-                tooltip=[
-                    alt.Tooltip('time:T', title='Time', format='%H:%M'),
-                    alt.Tooltip('temp:Q', title='Temp (°C)', format='.1f')
-                ]
-            )
-            
-            # Add points to ensure we see individual data points
-            temp_points = alt.Chart(df_temp).mark_circle(
-                color='#3498db',
-                size=30
-            ).encode(
-                x='time:T',
-                y=alt.Y('temp:Q', scale=alt.Scale(domain=[t_min_adj, t_max_adj])),
-                tooltip=[
-                    alt.Tooltip('time:T', title='Time', format='%H:%M'),
-                    alt.Tooltip('temp:Q', title='Temp (°C)', format='.1f')
-                ]
-            )
-            
-            temp_layer = temp_line + temp_points
+            temp_layer = temp_line_tpl.properties(data=df_temp) + temp_points_tpl.properties(data=df_temp)
         else:
             temp_layer = alt.Chart(pd.DataFrame()).mark_line()
 
-        # Add a vertical line for Midnight
-        tomorrow_start = now.replace(hour=0, minute=0, second=0, microsecond=0) + pd.Timedelta(days=1)
-        midnight_line = alt.Chart(pd.DataFrame({'x': [tomorrow_start]})).mark_rule(
-            color='white',
-            strokeDash=[5, 5],
-            strokeWidth=2
-        ).encode(
-            x='x:T'
-        )
-        
+        # Midnight marker only changes once a day
+        midnight_line = _midnight_line(now.date())
+
         # Layering charts
         # Resolve scales as independent to get separate axes, but they are aligned by our manual domain calculation
         final_chart = alt.layer(price_chart, temp_layer, zero_line, midnight_line).resolve_scale(
@@ -624,25 +674,16 @@ def render_electricity_prices() -> None:
         
         # Statistics summary
         summary = fingrid_prices.get_price_summary(price_data)
-        if show_total:
-            # Adjust metrics for Total Price
-            offset = AI_TRANSFER + BI_BASE
-            avg_val = summary['avg'] + offset
-            min_val = summary['min'] + offset
-            max_val = summary['max'] + offset
-        else:
-            avg_val = summary['avg']
-            min_val = summary['min']
-            max_val = summary['max']
-
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Average Price", f"{avg_val:.2f} c / kWh")
-        with col2:
-            st.metric("Min Price", f"{min_val:.2f} c / kWh")
-        with col3:
-            st.metric("Max Price", f"{max_val:.2f} c / kWh")
-            
+        # Total view shifts every statistic by the fixed per-kWh components
+        offset = AI_TRANSFER + BI_BASE if show_total else 0.0
+        metrics = (
+            ("Average Price", summary['avg']),
+            ("Min Price", summary['min']),
+            ("Max Price", summary['max']),
+        )
+        for col, (label, val) in zip(st.columns(len(metrics)), metrics):
+            col.metric(label, f"{val + offset:.2f} c / kWh")
+
         st.altair_chart(final_chart, use_container_width=True)
         
         st.caption(f"💡 prices (c / kWh) and Paippinen temp (°C). Transfer Fee={AI_TRANSFER}, Fixed Margin={BI_BASE}. Blue line=Temp, Bars=Price. Blue=Past, Grey=Future, Green=Cheapest 2h, Red=Expensive 2h.")
@@ -697,8 +738,9 @@ def main() -> None:
     # Weather
     render_weather_alert()
 
-    # Electricity prices
-    render_electricity_prices()
+    # Electricity prices (opt-in: skips the price/temperature fetches and chart build when off)
+    if st.toggle("⚡ Show electricity prices & temperature", key="show_prices"):
+        render_electricity_prices()
 
     # External embeds
     embeds: List[Tuple[str, str, int, bool]] = [
@@ -728,6 +770,8 @@ def main() -> None:
     # Misc section
     st.title("😂 Misc")
     render_joke()
+
+    from movie_picker import movie_spotlight
     movie_spotlight()
 
 
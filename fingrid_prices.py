@@ -3,15 +3,25 @@ Electricity spot price client using sähkötin.fi API.
 Provides 15-minute interval prices including VAT and service fees.
 """
 
-import requests
+import numpy as np
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Tuple
 from zoneinfo import ZoneInfo
 
+from http_utils import get_session
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - orjson optional, fall back to stdlib json
+    orjson = None
+
 # Constants
 TZ = ZoneInfo("Europe/Helsinki")
 SAHKOTIN_URL = "https://sahkotin.fi/prices?quarter&fix&vat"
 
+# Shared session: keeps the TLS connection alive and asks for a compressed payload
+_SESSION = get_session()
+
 def fetch_prices(start_time: datetime) -> List[Dict]:
     """
     Fetch prices from sähkötin.fi starting from start_time.
@@ -26,9 +36,10 @@ def fetch_prices(start_time: datetime) -> List[Dict]:
     url = f"{SAHKOTIN_URL}&start={start_iso}"
     
     try:
-        r = requests.get(url, timeout=15)
+        r = _SESSION.get(url, timeout=15)
         r.raise_for_status()
-        return r.json().get('prices', [])
+        payload = orjson.loads(r.content) if orjson else r.json()
+        return payload.get('prices', [])
     except Exception as e:
         print(f"Error fetching prices: {e}")
         return []
@@ -87,12 +98,12 @@ def get_price_summary(price_data: List[Dict]) -> Dict[str, float]:
     if not price_data:
         return {"min": 0.0, "max": 0.0, "avg": 0.0}
 
-    values = [item['value'] for item in price_data]
-    
+    values = np.fromiter((item['value'] for item in price_data), dtype=np.float64, count=len(price_data))
+
     return {
-        "min": min(values),
-        "max": max(values),
-        "avg": sum(values) / len(values),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "avg": float(values.mean()),
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""
+http_utils.py
+-------------
+Shared HTTP plumbing for the data modules (trains, roads, weather).
+
+One pooled requests.Session per process, so repeated FMI and Digitraffic
+calls reuse their TCP/TLS connections instead of handshaking every time.
+No Streamlit imports.
+"""
+
+import functools
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "R-train-dashboard/1.0"
+
+# urllib3 only decodes Brotli when one of these packages is installed,
+# so advertise "br" only then
+try:
+    import brotli  # type: ignore  # noqa: F401
+    _HAS_BROTLI = True
+except ImportError:  # pragma: no cover - brotli optional
+    try:
+        import brotlicffi  # type: ignore  # noqa: F401
+        _HAS_BROTLI = True
+    except ImportError:
+        _HAS_BROTLI = False
+
+ACCEPT_ENCODING = "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate"
+
+
+def _build_session() -> requests.Session:
+    """Session with a connection pool and backoff retries on transient 5xx and 429."""
+    s = requests.Session()
+    # connect/read errors are left to the callers' own retry loops so the two don't multiply;
+    # 429 (TMDb rate limit) is retried after the server's Retry-After
+    retry = Retry(
+        total=2, connect=0, read=0, backoff_factor=0.2,
+        status_forcelist=(429, 502, 503, 504), raise_on_status=False,
+    )
+    # pool_maxsize is per host: build_map's fetch pool plus the per-station
+    # fan-out in roads.py can have ~25 requests in flight to tie.digitraffic.fi
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers["User-Agent"] = USER_AGENT
+    s.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return s
+
+
+session = _build_session()
+
+
+def get_session() -> requests.Session:
+    """Return the shared session (single place to swap it, e.g. in a REPL)."""
+    return session
+
+
+def ttl_cache(seconds: float, maxsize: int = 128, cache_if=None):
+    """
+    Memoize a function for `seconds` (Streamlit-free counterpart of st.cache_data).
+    cache_if(result) -> bool can veto storing a result, e.g. error tuples.
+    Concurrent callers of the same key wait for one computation instead of all
+    fetching at once.
+    """
+    def decorator(fn):
+        store = {}
+        key_locks = {}
+        lock = threading.Lock()
+
+        def lookup(key):
+            with lock:
+                hit = store.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return True, hit[1]
+            return False, None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            found, value = lookup(key)
+            if found:
+                return value
+
+            with lock:
+                key_lock = key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                # Another caller may have filled the entry while this one waited
+                found, value = lookup(key)
+                if found:
+                    return value
+
+                result = fn(*args, **kwargs)
+                if cache_if is None or cache_if(result):
+                    now = time.monotonic()
+                    with lock:
+                        if key not in store and len(store) >= maxsize:
+                            # Drop expired entries, or else the one expiring soonest
+                            evict = [k for k, (exp, _) in store.items() if exp <= now]
+                            if not evict:
+                                evict = [min(store, key=lambda k: store[k][0])]
+                            for k in evict:
+                                store.pop(k, None)
+                                key_locks.pop(k, None)
+                        store[key] = (now + seconds, result)
+                return result
+
+        def cache_clear():
+            with lock:
+                store.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
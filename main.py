@@ -10,14 +10,14 @@ Streamlit dashboard combining:
 Behavior:
 - Weather summary shows Paippinen daylight info and 4-hour forecast blocks for Järvenpää and Helsinki.
 - Trains render immediately on first run.
-- After trains are shown, the app triggers one rerun to load the roads map.
+- The roads map fills its placeholder after trains are shown, in the same run.
 - Compact layout (minimal whitespace).
 """
 
 import json
 import os
-import textwrap
-from datetime import datetime, time as dtime
+import string
+from datetime import datetime, time as dtime, timezone
 import zoneinfo
 
 import streamlit as st
@@ -34,8 +34,11 @@ st.set_page_config(
 # ----------------------------
 # 2) GLOBAL CSS — tighten layout
 # ----------------------------
-st.markdown(
-    """
+# Static markup lives in constants so each rerun only references it
+HR_HTML = "<hr style='margin:0.4em 0;'>"
+HR_SOLID_HTML = "<hr style='margin:0.4em 0; border: 1px solid #ccc;'>"
+
+GLOBAL_CSS = """
     <style>
         .block-container {
             padding-top: 1.3rem !important;
@@ -87,6 +90,31 @@ st.markdown(
             padding: 0.7em 0.85em;
             height: 100%;
         }
+        .forecast-columns {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 1rem;
+        }
+        .forecast-columns > div {
+            flex: 1 1 280px;
+            min-width: 0;
+        }
+        .forecast-note {
+            padding: 0.7em 0.85em;
+            border-radius: 0.5em;
+            font-size: 0.85em;
+            background: #fff8e1;
+            color: #7a5b00;
+        }
+        .forecast-note.error {
+            background: #fdecea;
+            color: #8a1c1c;
+        }
+        .updated-at {
+            font-size: 0.85em;
+            color: gray;
+            text-align: center;
+        }
         .forecast-title {
             font-weight: 700;
             font-size: 1em;
@@ -136,20 +164,134 @@ st.markdown(
             font-feature-settings: "tnum";
         }
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
 
 st.title("🚆 Ainola Commute Dashboard")
 
 TZ = zoneinfo.ZoneInfo("Europe/Helsinki")
 
+# One clock read per script run, reused by every section below
+NOW_UTC = datetime.now(timezone.utc)
+NOW_LOCAL = NOW_UTC.astimezone(TZ)
+
+# ----------------------------
+# 2b) MODULE LOADERS (once per process, shared by all sessions)
+# ----------------------------
+@st.cache_resource
+def _weather_mod():
+    import weather
+    return weather
+
+@st.cache_resource
+def _trains_mod():
+    import trains
+    return trains
+
+@st.cache_resource
+def _trains_display_mod():
+    import trains_display
+    return trains_display
+
+@st.cache_resource
+def _roads_mod():
+    """Import roads_display once per process (import itself does no fetching)."""
+    import roads_display
+    return roads_display
+
 # ----------------------------
 # 3) WEATHER SUMMARY (TOP)
 # ----------------------------
-try:
-    from weather import daylight_summary, interval_forecast
+# Card markup compiled once at import; only the values change per run
+SUN_CARD_TEMPLATE = string.Template("""
+<div class="sun-card">
+    <h4>☀️ Paippinen daylight today</h4>
+    <div class="sun-grid">
+        <div class="sun-item"><span>Sunrise</span>$sunrise</div>
+        <div class="sun-item"><span>Sunset</span>$sunset</div>
+        <div class="sun-item"><span>Day length</span>$day_length</div>
+    </div>
+</div>
+""")
+
+# One forecast row, written flat so no dedent/strip is needed per row
+FORECAST_ROW_TEMPLATE = (
+    '<div class="forecast-row">'
+    '<div class="forecast-time">{label}</div>'
+    '<div class="forecast-icon">{icon}</div>'
+    '<div class="forecast-desc">{desc}</div>'
+    '<div class="forecast-metric">{temp}</div>'
+    '<div class="forecast-metric">{rain}</div>'
+    '<div class="forecast-metric">{wind}</div>'
+    '</div>'
+)
+
+FORECAST_CARD_TEMPLATE = string.Template(
+    '<div class="forecast-card">'
+    '<div class="forecast-title">$title</div>'
+    '<div class="forecast-range">$range_str</div>'
+    '<div class="forecast-rows">$rows</div>'
+    '</div>'
+)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def cached_interval_forecast(place):
+    """FMI interval forecast for a place, shared across sessions for 10 min."""
+    data, error = _weather_mod().interval_forecast(place)
+    if error:
+        # Raising keeps failures out of the cache so the next run retries
+        raise RuntimeError(error)
+    return data
+
+def _fmt_val(value, unit):
+    if value is None:
+        return "—"
+    return f"{value:.1f} {unit}"
+
+def _build_row(item):
+    """One forecast interval → FORECAST_ROW_TEMPLATE markup."""
+    icon_html = (
+        f"<img src='{item['icon_url']}' alt='{item['symbol_description']}' />"
+        if item.get("icon_url")
+        else "<span class='fallback-icon'>☁️</span>"
+    )
+    return FORECAST_ROW_TEMPLATE.format(
+        label=item.get("label", ""),
+        icon=icon_html,
+        desc=item.get("symbol_description", ""),
+        temp=_fmt_val(item.get("temperature_c"), "°C"),
+        rain=_fmt_val(item.get("precip_mm"), "mm/h"),
+        wind=_fmt_val(item.get("wind_ms"), "m/s"),
+    )
+
+@st.cache_data(ttl=600, show_spinner=False)
+def build_interval_card_html(title, place):
+    """
+    Finished forecast card HTML for a place (None when FMI returned no intervals).
+    Cached as a string so reruns skip both the fetch and the formatting.
+    """
+    data = cached_interval_forecast(place)
+
+    intervals = data.get("intervals", [])
+    if not intervals:
+        return None
 
+    start = data.get("start")
+    end = data.get("end")
+    range_str = ""
+    if start and end:
+        range_str = f"{start.strftime('%a %d.%m %H:%M')} → {end.strftime('%a %d.%m %H:%M')}"
+
+    return FORECAST_CARD_TEMPLATE.substitute(
+        title=title, range_str=range_str, rows="".join(_build_row(item) for item in intervals)
+    )
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def cached_daylight(lat, lon, day):
+    """Sunrise/sunset for a location; `day` (ISO date) rolls the cache at local midnight."""
+    return _weather_mod().daylight_summary(lat, lon)
+
+try:
     config_path = os.path.join(os.path.dirname(__file__), "config.json")
     config = {}
     if os.path.exists(config_path):
@@ -158,89 +300,37 @@ try:
 
     home_coords = config.get("HOME_COORDS", {})
     if home_coords:
-        sun_info = daylight_summary(home_coords.get("lat"), home_coords.get("lon"))
+        sun_info = cached_daylight(
+            home_coords.get("lat"), home_coords.get("lon"), NOW_LOCAL.date().isoformat()
+        )
         sunrise = sun_info.get("sunrise") or "—"
         sunset = sun_info.get("sunset") or "—"
         day_length = sun_info.get("day_length") or "—"
-        sun_html = f"""
-        <div class="sun-card">
-            <h4>☀️ Paippinen daylight today</h4>
-            <div class="sun-grid">
-                <div class="sun-item"><span>Sunrise</span>{sunrise}</div>
-                <div class="sun-item"><span>Sunset</span>{sunset}</div>
-                <div class="sun-item"><span>Day length</span>{day_length}</div>
-            </div>
-        </div>
-        """
-        st.markdown(sun_html, unsafe_allow_html=True)
-
-    def render_interval_card(column, title, place):
-        data, error = interval_forecast(place)
-        if error:
-            column.error(error)
-            return
-
-        intervals = data.get("intervals", [])
-        if not intervals:
-            column.warning("No forecast data available.")
-            return
-
-        start = data.get("start")
-        end = data.get("end")
-        range_str = ""
-        if start and end:
-            range_str = f"{start.strftime('%a %d.%m %H:%M')} → {end.strftime('%a %d.%m %H:%M')}"
-
-        def fmt_val(value, unit):
-            if value is None:
-                return "—"
-            return f"{value:.1f} {unit}"
-
-        rows_html = []
-        for item in intervals:
-            icon_html = (
-                f"<img src='{item['icon_url']}' alt='{item['symbol_description']}' />"
-                if item.get("icon_url")
-                else "<span class='fallback-icon'>☁️</span>"
-            )
-            label = item.get("label", "")
-            desc = item.get("symbol_description", "")
-            temp_text = fmt_val(item.get("temperature_c"), "°C")
-            rain_text = fmt_val(item.get("precip_mm"), "mm/h")
-            wind_text = fmt_val(item.get("wind_ms"), "m/s")
-
-            row_html = textwrap.dedent(
-                f"""
-                <div class="forecast-row">
-                    <div class="forecast-time">{label}</div>
-                    <div class="forecast-icon">{icon_html}</div>
-                    <div class="forecast-desc">{desc}</div>
-                    <div class="forecast-metric">{temp_text}</div>
-                    <div class="forecast-metric">{rain_text}</div>
-                    <div class="forecast-metric">{wind_text}</div>
-                </div>
-                """
-            ).strip()
-            rows_html.append(row_html)
-
-        card_html = (
-            "<div class=\"forecast-card\">"
-            f"<div class=\"forecast-title\">{title}</div>"
-            f"<div class=\"forecast-range\">{range_str}</div>"
-            "<div class=\"forecast-rows\">"
-            f"{''.join(rows_html)}"
-            "</div>"
-            "</div>"
+        sun_html = SUN_CARD_TEMPLATE.substitute(
+            sunrise=sunrise, sunset=sunset, day_length=day_length
         )
-        column.markdown(card_html, unsafe_allow_html=True)
+    else:
+        sun_html = ""
 
-    cols = st.columns(2)
-    render_interval_card(cols[0], "Järvenpää – 4h forecast blocks", "Järvenpää")
-    render_interval_card(cols[1], "Helsinki – 4h forecast blocks", "Helsinki")
-
-    timestamp = datetime.now().strftime("%H:%M")
+    def interval_card_html(title, place):
+        """Forecast card, or a small inline note when the data is missing."""
+        try:
+            card_html = build_interval_card_html(title, place)
+        except RuntimeError as error:
+            return f'<div class="forecast-note error">{error}</div>'
+        if card_html is None:
+            return '<div class="forecast-note">No forecast data available.</div>'
+        return card_html
+
+    # Sun card, both forecast cards and the timestamp go out as one markdown block
+    timestamp = NOW_LOCAL.strftime("%H:%M")
     st.markdown(
-        f"<p style='font-size:0.85em;color:gray;text-align:center;'>Updated at {timestamp}</p>",
+        f"{sun_html}"
+        '<div class="forecast-columns">'
+        f"<div>{interval_card_html('Järvenpää – 4h forecast blocks', 'Järvenpää')}</div>"
+        f"<div>{interval_card_html('Helsinki – 4h forecast blocks', 'Helsinki')}</div>"
+        "</div>"
+        f'<p class="updated-at">Updated at {timestamp}</p>',
         unsafe_allow_html=True,
     )
 
@@ -250,54 +340,79 @@ except Exception as e:
 # ----------------------------
 # 4) TRAINS SECTION (IMMEDIATE)
 # ----------------------------
+@st.cache_data(ttl=30, show_spinner=False)
+def get_trains_html():
+    """
+    Rendered train board, shared by all sessions for 30 s.
+    Only boards from successful fetches are cached: strict=True raises on failure.
+    """
+    return _trains_display_mod().render_trains_html(strict=True)
+
 with st.spinner("Loading live train data..."):
     try:
-        from trains_display import render_trains_html
-        trains_html = render_trains_html()
+        trains_html = get_trains_html()
         st.components.v1.html(trains_html, height=550, scrolling=True)
     except Exception as e:
         st.error(f"❌ Failed to load train section: {e}")
 
-st.markdown("<hr style='margin:0.4em 0; border: 1px solid #ccc;'>", unsafe_allow_html=True)
+st.markdown(HR_SOLID_HTML, unsafe_allow_html=True)
 
 # ----------------------------
-# 5) ROADS SECTION (DEFERRED LOAD)
+# 5) ROADS SECTION (PLACEHOLDER, SAME RUN)
 # ----------------------------
-if "phase" not in st.session_state:
-    st.session_state.phase = 0
+# Map data is cached this long, and the map fragment re-renders on the same cadence
+ROADS_REFRESH_SECONDS = 300
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=ROADS_REFRESH_SECONDS)
 def get_roads_html():
-    """Build and return the Folium map HTML (cached for 5 min)."""
-    from roads_display import m as roads_map
-    return roads_map._repr_html_()
-
-if st.session_state.phase == 0:
-    st.info("Loading roads and sensors…")
-    st.session_state.phase = 1
-    st.rerun()
-else:
+    """
+    Build and return the Folium map HTML (cached for 5 min).
+    Renders the full page directly: _repr_html_() would wrap it in a second,
+    escaped iframe inside the component iframe.
+    """
+    return _roads_mod().build_map().get_root().render()
+
+@st.fragment(run_every=ROADS_REFRESH_SECONDS)
+def roads_fragment():
+    """
+    Roads map as a self-refreshing fragment: every ROADS_REFRESH_SECONDS it
+    reruns on its own (picking up the expired cache) without re-executing the page.
+    """
+    # Everything above is already on screen; fill this slot in place (no second run)
+    roads_placeholder = st.empty()
+    roads_placeholder.info("Loading roads and sensors…")
     with st.spinner("Fetching road forecasts, weather, and sensors..."):
         try:
             html_map = get_roads_html()
-            st.components.v1.html(html_map, height=700, scrolling=False)
+            with roads_placeholder.container():
+                st.components.v1.html(html_map, height=700, scrolling=False)
         except Exception as e:
-            st.error(f"❌ Failed to load road map: {e}")
+            roads_placeholder.error(f"❌ Failed to load road map: {e}")
+
+roads_fragment()
 
 # ----------------------------
 # 6) RAIN RADAR EMBED (Sataako.fi)
 # ----------------------------
-st.markdown("<hr style='margin:0.4em 0;'>", unsafe_allow_html=True)
+def lazy_iframe(url, height, scrolling=False, title=""):
+    """
+    Embed a third-party page directly in the page (not inside a component
+    iframe) so the browser's loading="lazy" can defer it until scrolled near.
+    """
+    st.markdown(
+        f'<iframe src="{url}" title="{title}" width="100%" height="{height}" '
+        f'loading="lazy" fetchpriority="low" scrolling="{"yes" if scrolling else "no"}" '
+        f'style="border:0;display:block;"></iframe>',
+        unsafe_allow_html=True,
+    )
+
+st.markdown(HR_HTML, unsafe_allow_html=True)
 st.subheader("🌧️ Live Rain Radar")
 
 # Helsinki-area centered map, side panel collapsed
 sataako_url = "https://www.sataako.fi?x=2776307.5&y=8438349.3&zoom=8&collapsed=true"
 
-st.components.v1.iframe(
-    sataako_url,
-    height=700,
-    scrolling=False,
-)
+lazy_iframe(sataako_url, height=700, scrolling=False, title="Sataako rain radar")
 
 
 # ----------------------------
@@ -309,17 +424,23 @@ def announcement_window_active(now=None):
     return dtime(15, 0) <= now.time() < dtime(17, 0)
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_get_trains(origin, dest, limit=None):
+    """
+    get_trains shared across sessions and clicks for 30 s.
+    strict=True makes a failed fetch raise, so it isn't cached as "no trains".
+    """
+    return _trains_mod().get_trains(origin, dest, limit=limit, strict=True)
+
+
 def next_helsinki_departure_text():
     """Return spoken text for the next R-train leaving Helsinki."""
     try:
-        from trains import get_trains, load_config
-
-        cfg = load_config()
-        home = cfg.get("HOME_STATIONS", {})
+        home = _trains_mod().cfg.get("HOME_STATIONS", {})
         origin = home.get("destination", "HKI")
         dest = home.get("origin", "AIN")
 
-        departures = get_trains(origin, dest)
+        departures = cached_get_trains(origin, dest, limit=1)
         if not departures:
             return None, "No R-train departures available right now."
 
@@ -331,63 +452,76 @@ def next_helsinki_departure_text():
     except Exception as exc:  # pragma: no cover - defensive guard for runtime errors
         return None, f"Unable to fetch departure info: {exc}"
 
+@st.cache_data(ttl=60, show_spinner=False)
+def announcement_payload(minute_key):
+    """
+    (announcement, speech script HTML) for the current minute.
+    minute_key ("YYYYmmddHHMM") makes repeated clicks within a minute free.
+    """
+    announcement, err = next_helsinki_departure_text()
+    if err or not announcement:
+        # Raising keeps failures out of the cache so the next click retries
+        raise RuntimeError(err or "No R-train departures available right now.")
+    speech_html = f"""
+    <script>
+        const text = {json.dumps(announcement)};
+        const msg = new SpeechSynthesisUtterance(text);
+        window.speechSynthesis.cancel();
+        window.speechSynthesis.speak(msg);
+    </script>
+    """
+    return announcement, speech_html
+
 # ----------------------------
 # 7) FOOTER
 # ----------------------------
-st.markdown("<hr style='margin:0.4em 0;'>", unsafe_allow_html=True)
+st.markdown(HR_HTML, unsafe_allow_html=True)
 st.subheader("🔗 External resources")
 st.markdown(
     "Explore the detailed FMI local forecast for Paippinen and live Junalahdot departure boards.",
     help="Embedded pages load from en.ilmatieteenlaitos.fi and junalahdot.fi.",
 )
 
-st.components.v1.iframe(
+lazy_iframe(
     "https://en.ilmatieteenlaitos.fi/local-weather/sipoo/paippinen",
     height=820,
     scrolling=True,
+    title="FMI local weather, Paippinen",
 )
 
 train_cols = st.columns([1, 0.45, 1])
 with train_cols[0]:
-    st.components.v1.iframe(
+    lazy_iframe(
         "https://junalahdot.fi/518952272?command=fs&id=219&dt=dep&lang=3&did=47&title=Ainola%20-%20Helsinki",
         height=520,
         scrolling=True,
+        title="Ainola → Helsinki departures",
     )
 
 with train_cols[1]:
     st.markdown("<div style='height:20px'></div>", unsafe_allow_html=True)
-    active_window = announcement_window_active()
+    active_window = announcement_window_active(NOW_LOCAL)
     if not active_window:
         st.caption("Audio available all day; originally intended for 15–17 Helsinki time.")
 
     if st.button("🔈 Hear next Helsinki R-train", use_container_width=True):
-        announcement, err = next_helsinki_departure_text()
-        if err:
-            st.warning(err)
-        elif announcement:
+        try:
+            announcement, speech_html = announcement_payload(NOW_LOCAL.strftime("%Y%m%d%H%M"))
+        except RuntimeError as e:
+            st.warning(str(e))
+        else:
             st.success(announcement)
-            safe_text = json.dumps(announcement)
-            st.components.v1.html(
-                f"""
-                <script>
-                    const text = {safe_text};
-                    const msg = new SpeechSynthesisUtterance(text);
-                    window.speechSynthesis.cancel();
-                    window.speechSynthesis.speak(msg);
-                </script>
-                """,
-                height=20,
-            )
+            st.components.v1.html(speech_html, height=20)
 
 with train_cols[2]:
-    st.components.v1.iframe(
+    lazy_iframe(
         "https://junalahdot.fi/518952272?command=fs&id=47&dt=dep&lang=3&did=219&title=Helsinki%20-%20Ainola",
         height=520,
         scrolling=True,
+        title="Helsinki → Ainola departures",
     )
 
-st.markdown("<hr style='margin:0.4em 0;'>", unsafe_allow_html=True)
+st.markdown(HR_HTML, unsafe_allow_html=True)
 st.caption(
     "Data from FMI and Digitraffic.fi — trains render immediately; "
     "roads and sensors load after. Roads map cached for 5 minutes. "
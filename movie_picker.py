@@ -2,21 +2,31 @@
 # Streamlit TMDb movie browser — clean, fast, stable toolbar (no spinners)
 
 import random
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 
+from http_utils import get_session
+
 # -----------------------------
 # Config / constants
 # -----------------------------
 TMDB_API_KEY = st.secrets["TMDB_API_KEY"]
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
 PLACEHOLDER_POSTER = "https://via.placeholder.com/180x270.png?text=No+Poster"
+RANDOM_PAGES = 5  # "Random" picks from one of the first N discover pages
+
+# Pooled keep-alive session for all TMDb calls (responses are small, TLS setup dominates);
+# pool size and retry policy live in http_utils
+_SESSION = get_session()
 
 # -----------------------------
 # Caching helpers
 # -----------------------------
-@st.cache_data(ttl=3600)
-def tmdb_discover(params: dict) -> list:
+TMDB_PAGE_SIZE = 20
+
+def _discover_page(params: dict) -> list:
+    """One /discover/movie page (uncached, safe to call from worker threads)."""
     base = "https://api.themoviedb.org/3/discover/movie"
     default = {
         "api_key": TMDB_API_KEY,
@@ -28,28 +38,33 @@ def tmdb_discover(params: dict) -> list:
         "vote_count.gte": 50,
     }
     merged = {**default, **params}
-    r = requests.get(base, params=merged, timeout=10).json()
+    r = _SESSION.get(base, params=merged, timeout=10).json()
     return r.get("results", [])
 
+@st.cache_data(ttl=3600)
+def tmdb_discover(params: dict) -> list:
+    return _discover_page(params)
+
+@st.cache_data(ttl=3600)
 def _get_multi_page(params: dict, pages: int = 3) -> list:
-    out = []
-    for p in range(1, pages + 1):
-        batch = tmdb_discover({**params, "page": p})
-        if not batch:
-            break
-        out.extend(batch)
+    """Page 1 first; if it was full, fetch the remaining pages concurrently."""
+    out = _discover_page({**params, "page": 1})
+    if pages < 2 or len(out) < TMDB_PAGE_SIZE:
+        return out
+    with ThreadPoolExecutor(max_workers=pages - 1) as pool:
+        batches = pool.map(lambda p: _discover_page({**params, "page": p}), range(2, pages + 1))
+        for batch in batches:  # page order; stop at the first empty page as before
+            if not batch:
+                break
+            out.extend(batch)
     return out
 
 @st.cache_data(ttl=3600)
-def get_tmdb_details(movie_id: int) -> dict:
+def get_tmdb_movie_bundle(movie_id: int) -> dict:
+    """Movie details with credits appended: one request instead of two."""
     url = f"https://api.themoviedb.org/3/movie/{movie_id}"
-    r = requests.get(url, params={"api_key": TMDB_API_KEY, "language": "en-US"}, timeout=10)
-    return r.json()
-
-@st.cache_data(ttl=3600)
-def get_tmdb_credits(movie_id: int) -> dict:
-    url = f"https://api.themoviedb.org/3/movie/{movie_id}/credits"
-    r = requests.get(url, params={"api_key": TMDB_API_KEY, "language": "en-US"}, timeout=10)
+    params = {"api_key": TMDB_API_KEY, "language": "en-US", "append_to_response": "credits"}
+    r = _SESSION.get(url, params=params, timeout=10)
     return r.json()
 
 @st.cache_data(ttl=3600)
@@ -64,6 +79,7 @@ def tmdb_most_recent(vote_count_min: int = 50) -> dict | None:
 # -----------------------------
 # Discover helpers (relative)
 # -----------------------------
+@st.cache_data(ttl=3600)
 def discover_more_popular_than(current_pop: float, exclude_id: int | None = None) -> list:
     results = _get_multi_page({
         "popularity.gte": current_pop + 0.1,
@@ -72,6 +88,7 @@ def discover_more_popular_than(current_pop: float, exclude_id: int | None = None
     }, pages=3)
     return [m for m in results if m.get("id") != exclude_id and float(m.get("popularity", 0)) > current_pop]
 
+@st.cache_data(ttl=3600)
 def discover_older_within_2y(current_year: int, exclude_id: int | None = None) -> list:
     start = f"{max(1870, current_year-2)}-01-01"
     end   = f"{max(1870, current_year-1)}-12-31"
@@ -81,6 +98,7 @@ def discover_older_within_2y(current_year: int, exclude_id: int | None = None) -
     }, pages=3)
     return [m for m in results if m.get("id") != exclude_id]
 
+@st.cache_data(ttl=3600)
 def discover_newer_within_2y(current_year: int, exclude_id: int | None = None) -> list:
     start = f"{current_year+1}-01-01"
     end   = f"{current_year+2}-12-31"
@@ -94,14 +112,14 @@ def discover_newer_within_2y(current_year: int, exclude_id: int | None = None) -
 def discover_same_director_movies(person_id: int, exclude_id: int | None = None) -> list:
     """Strict: only films this person directed, sorted by popularity."""
     url = f"https://api.themoviedb.org/3/person/{person_id}/movie_credits"
-    r = requests.get(url, params={"api_key": TMDB_API_KEY, "language": "en-US"}, timeout=10).json()
+    r = _SESSION.get(url, params={"api_key": TMDB_API_KEY, "language": "en-US"}, timeout=10).json()
     directed = [m for m in r.get("crew", []) if m.get("job") == "Director" and m.get("id") != exclude_id]
     directed.sort(key=lambda x: x.get("popularity", 0), reverse=True)
     return directed
 
 def discover_same_director(current_movie: dict) -> list:
     cur_id = current_movie.get("id")
-    credits = get_tmdb_credits(cur_id)
+    credits = get_tmdb_movie_bundle(cur_id).get("credits", {})
     directors = [c for c in credits.get("crew", []) if c.get("job") == "Director"]
     if not directors:
         return []
@@ -112,7 +130,7 @@ def discover_same_genre(current_movie: dict) -> list:
     cur_id = current_movie.get("id")
     gids = current_movie.get("genre_ids") or []
     if not gids:
-        details = get_tmdb_details(cur_id)
+        details = get_tmdb_movie_bundle(cur_id)
         gids = [g["id"] for g in details.get("genres", [])]
     if not gids:
         return []
@@ -129,8 +147,8 @@ def build_poster_url(poster_path: str | None) -> str:
     return f"{TMDB_IMAGE_BASE}{poster_path}" if poster_path else PLACEHOLDER_POSTER
 
 def get_people_summary(movie_id: int) -> tuple[str, str, str]:
-    details = get_tmdb_details(movie_id)
-    credits = get_tmdb_credits(movie_id)
+    details = get_tmdb_movie_bundle(movie_id)
+    credits = details.get("credits", {})
     director = ""
     for c in credits.get("crew", []):
         if c.get("job") == "Director":
@@ -232,10 +250,10 @@ def main():
 
     # Decide action (no UI calls here; just compute)
     if btn_random:
-        pool = _get_multi_page({
-            "primary_release_date.gte": "2022-01-01",
-            "vote_count.gte": 100,
-        }, pages=3)
+        # One random page is enough to pick one film (1 request instead of 3);
+        # fall back to page 1 if the random page is past the end of the results
+        params = {"primary_release_date.gte": "2022-01-01", "vote_count.gte": 100}
+        pool = tmdb_discover({**params, "page": random.randint(1, RANDOM_PAGES)}) or tmdb_discover(params)
         if pool:
             selected = random.choice(pool)
             
@@ -284,7 +302,6 @@ if __name__ == "__main__":
 def movie_spotlight():
     """Embeddable Streamlit widget for Movie Spotlight."""
     import streamlit as st
-    import random
 
     # Hide Streamlit's "Running..." spinner and messages
     st.markdown(
@@ -319,6 +336,12 @@ def movie_spotlight():
         unsafe_allow_html=True,
     )
 
+    _movie_fragment()
+
+
+@st.fragment
+def _movie_fragment():
+    """Toolbar + card; a button click reruns only this fragment, not the whole page."""
     toolbar_cols = st.columns(6)
     btn_random   = toolbar_cols[0].button("🎲 Random", key="btn_random")
     btn_popular  = toolbar_cols[1].button("🔥 More popular", key="btn_more_popular")
@@ -327,10 +350,8 @@ def movie_spotlight():
     btn_director = toolbar_cols[4].button("🎬 Same director", key="btn_same_director")
     btn_genre    = toolbar_cols[5].button("🎭 Same genre", key="btn_same_genre")
 
-    # --- Persistent placeholder for the movie card ---
-    if "movie_placeholder" not in st.session_state:
-        st.session_state.movie_placeholder = st.empty()
-    movie_container = st.session_state.movie_placeholder
+    # --- Placeholder for the movie card (recreated on each fragment run) ---
+    movie_container = st.empty()
 
     # Always render last known movie (prevents jump)
     current_movie = st.session_state.get("current_movie")
@@ -344,10 +365,10 @@ def movie_spotlight():
     cur = st.session_state.get("current_movie")
 
     if btn_random:
-        pool = _get_multi_page({
-            "primary_release_date.gte": "2022-01-01",
-            "vote_count.gte": 100,
-        }, pages=3)
+        # One random page is enough to pick one film (1 request instead of 3);
+        # fall back to page 1 if the random page is past the end of the results
+        params = {"primary_release_date.gte": "2022-01-01", "vote_count.gte": 100}
+        pool = tmdb_discover({**params, "page": random.randint(1, RANDOM_PAGES)}) or tmdb_discover(params)
         if pool:
             selected = random.choice(pool)
 
@@ -22,20 +22,39 @@ import requests
 from requests.exceptions import ReadTimeout, ConnectionError
 from datetime import datetime
 import time
+import hashlib
 import json
 import os
 import re
 import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from http_utils import get_session, ttl_cache
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - orjson optional, fall back to stdlib json
+    orjson = None
+
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - ijson optional, fall back to parsing the whole payload
+    ijson = None
 
 # ----------------------------
 # 2) CONFIGURATION
 # ----------------------------
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
 
+@lru_cache(maxsize=1)
 def load_config():
-    """Load shared configuration file."""
+    """Load shared configuration file (read once per process; treat the dict as read-only)."""
     if not os.path.exists(CONFIG_PATH):
         raise FileNotFoundError("⚠️ config.json not found.")
+    if orjson:
+        with open(CONFIG_PATH, "rb") as f:
+            return orjson.loads(f.read())
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -47,14 +66,22 @@ Y_MIN = BOUNDING_BOX["Y_MIN"]
 X_MAX = BOUNDING_BOX["X_MAX"]
 Y_MAX = BOUNDING_BOX["Y_MAX"]
 
-ROADS_OF_INTEREST = set(cfg["ROADS_OF_INTEREST"])
-TMS_STATIONS = cfg.get("TMS_STATIONS", [])
-RWIS_STATIONS = cfg.get("RWIS_STATIONS", [])
-CAMERA_STATIONS = cfg.get("CAMERA_STATIONS", [])
+ROADS_OF_INTEREST = frozenset(cfg["ROADS_OF_INTEREST"])
+# Station id lists are only used for membership tests inside per-feature loops
+TMS_STATIONS = frozenset(cfg.get("TMS_STATIONS", []))
+TMS_STATIONS_STR = frozenset(str(s) for s in TMS_STATIONS)  # ids may arrive as strings
+RWIS_STATIONS = frozenset(cfg.get("RWIS_STATIONS", []))
+CAMERA_STATIONS = frozenset(cfg.get("CAMERA_STATIONS", []))
 FUTURE_MINUTES = cfg.get("FUTURE_MINUTES", 180)
 
+# Live road data is reused for this many seconds across map builds and summaries
+ROADS_CACHE_SECONDS = 300
+
 HEADERS = {"Digitraffic-User": cfg.get("USER_AGENT", "Birgir-ainola-dashboard/1.0")}
 
+# Pooled keep-alive session shared with trains/weather
+SESSION = get_session()
+
 # ----------------------------
 # 3) GENERIC FETCH HELPERS
 # ----------------------------
@@ -62,11 +89,12 @@ def get_json(url, retries=2, timeout=6):
     """Safely fetch JSON with retry and graceful fallback on any HTTP error."""
     for attempt in range(retries + 1):
         try:
-            r = requests.get(url, headers=HEADERS, timeout=timeout)
+            r = SESSION.get(url, headers=HEADERS, timeout=timeout)
             if r.status_code == 404:
                 return None
             r.raise_for_status()
-            return r.json()
+            # GeoJSON payloads are large; orjson decodes them several times faster
+            return orjson.loads(r.content) if orjson else r.json()
         except (ReadTimeout, ConnectionError):
             if attempt == retries:
                 print(f"⚠️ Network error fetching {url}")
@@ -79,19 +107,107 @@ def get_json(url, retries=2, timeout=6):
             print(f"⚠️ Unexpected error for {url}: {e}")
             return None
 
+HTTP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "r-train-dashboard", "http")
+
+def get_json_revalidated(url, timeout=6):
+    """
+    get_json for slowly changing catalogs (station lists).
+    Keeps the last body on disk and revalidates it with ETag / Last-Modified,
+    so an unchanged catalog costs a bodiless 304 instead of a full download.
+    Falls back to plain get_json on any cache or network problem.
+    """
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    body_path = os.path.join(HTTP_CACHE_DIR, key + ".json")
+    meta_path = os.path.join(HTTP_CACHE_DIR, key + ".meta.json")
+
+    headers = dict(HEADERS)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if os.path.exists(body_path):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+    except (OSError, ValueError):
+        pass
+
+    try:
+        r = SESSION.get(url, headers=headers, timeout=timeout)
+        if r.status_code == 304:
+            with open(body_path, "rb") as f:
+                content = f.read()
+        else:
+            r.raise_for_status()
+            content = r.content
+            etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+            if etag or last_modified:
+                os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+                with open(body_path, "wb") as f:
+                    f.write(content)
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"etag": etag, "last_modified": last_modified}, f)
+        return orjson.loads(content) if orjson else json.loads(content)
+    except (requests.exceptions.RequestException, OSError, ValueError) as e:
+        print(f"⚠️ Revalidated fetch failed for {url}: {e}")
+        return get_json(url, timeout=timeout)
+
+def get_json_many(urls, max_workers=8):
+    """Fetch several URLs concurrently with get_json; results keep input order (None on failure)."""
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return list(pool.map(get_json, urls))
+
+def iter_features(url, timeout=10):
+    """
+    Yield GeoJSON features one at a time.
+    With ijson installed the response is stream-parsed, so only one feature
+    is held in memory at a time; otherwise falls back to get_json.
+    """
+    if ijson is None:
+        data = get_json(url)
+        yield from (data or {}).get("features", [])
+        return
+    # Errors (HTTP, network, truncated JSON) propagate instead of ending the stream
+    # early, so callers never mistake a partial feature list for a complete one
+    with SESSION.get(url, headers=HEADERS, timeout=timeout, stream=True) as r:
+        if r.status_code == 404:
+            return
+        r.raise_for_status()
+        r.raw.decode_content = True  # let urllib3 undo gzip/br before ijson sees it
+        yield from ijson.items(r.raw, "features.item", use_float=True)
+
 # ----------------------------
 # 4) COORDINATE HELPERS
 # ----------------------------
 def safe_coords(feature):
-    geom = feature.get("geometry")
-    if not geom or "coordinates" not in geom:
+    """(lon, lat) of the first point of any GeoJSON geometry, or (None, None)."""
+    coords = (feature.get("geometry") or {}).get("coordinates")
+    # Descend Multi*/LineString/Polygon nesting to the first position
+    while coords and isinstance(coords[0], list):
+        coords = coords[0]
+    if not coords or not isinstance(coords[0], (int, float)):
         return None, None
-    coords = geom["coordinates"]
-    if isinstance(coords[0], (int, float)):
-        return coords[0], coords[1]
-    elif isinstance(coords[0], list):
-        return safe_coords({"geometry": {"coordinates": coords[0]}})
-    return None, None
+    return coords[0], coords[1]
+
+@lru_cache(maxsize=1024)
+def fmt_iso(ts, pattern):
+    """
+    Format an ISO-8601 timestamp with strftime `pattern`; None if empty or unparsable.
+    Memoized by raw string: many sections and messages share the same timestamps.
+    """
+    if not ts:
+        return None
+    try:
+        # "Z" is replaced because fromisoformat only accepts it from Python 3.11
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if pattern == "%d.%m.%Y":
+        # Warning dates: plain integer formatting instead of strftime
+        return f"{dt.day:02d}.{dt.month:02d}.{dt.year}"
+    return dt.strftime(pattern)
 
 def inside_bbox(lon, lat):
     if lon is None or lat is None:
@@ -101,59 +217,72 @@ def inside_bbox(lon, lat):
 # ----------------------------
 # 5) FORECAST FETCHERS
 # ----------------------------
-def fetch_road_geometry():
-    url = (
-        f"https://tie.digitraffic.fi/api/weather/v1/forecast-sections"
-        f"?xMin={X_MIN}&yMin={Y_MIN}&xMax={X_MAX}&yMax={Y_MAX}"
-    )
-    data = get_json(url)
-    if data is None:
-        return []
-    return data.get("forecastSections", [])
+# Shared read-only fallback for missing nested objects (never mutated)
+_EMPTY = {}
+
+FORECAST_SECTIONS_URL = (
+    f"https://tie.digitraffic.fi/api/weather/v1/forecast-sections"
+    f"?xMin={X_MIN}&yMin={Y_MIN}&xMax={X_MAX}&yMax={Y_MAX}"
+)
+FORECASTS_URL = (
+    f"https://tie.digitraffic.fi/api/weather/v1/forecast-sections/forecasts"
+    f"?xMin={X_MIN}&yMin={Y_MIN}&xMax={X_MAX}&yMax={Y_MAX}"
+)
+
+def first_valid_float(values):
+    """First value that is a real (non-NaN) number, as float; None if there is none."""
+    for value in values:
+        if value is None:
+            continue
+        # Fast path: JSON numbers already arrive as int/float
+        if type(value) is float:
+            if value == value:  # NaN is the only float not equal to itself
+                return value
+            continue
+        if type(value) is int:
+            return float(value)
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            continue
+        if math.isnan(number):
+            continue
+        return number
+    return None
 
+# Only cached when both halves came back non-empty, so a failed fetch is retried
+@ttl_cache(ROADS_CACHE_SECONDS, cache_if=all)
 def fetch_road_forecasts():
-    geo_url = (
-        f"https://tie.digitraffic.fi/api/weather/v1/forecast-sections"
-        f"?xMin={X_MIN}&yMin={Y_MIN}&xMax={X_MAX}&yMax={Y_MAX}"
-    )
-    geo_data = get_json(geo_url)
+    """
+    Return (forecasts by section id, geometry features) for ROADS_OF_INTEREST.
+    Geometry is prefiltered to MultiLineString sections of those roads.
+    """
+    # Geometry and forecasts are independent requests
+    geo_data, forecast_data = get_json_many([FORECAST_SECTIONS_URL, FORECASTS_URL])
     geometry = geo_data.get("features", []) if geo_data else []
 
-    forecast_url = (
-        f"https://tie.digitraffic.fi/api/weather/v1/forecast-sections/forecasts"
-        f"?xMin={X_MIN}&yMin={Y_MIN}&xMax={X_MAX}&yMax={Y_MAX}"
-    )
-    forecast_data = get_json(forecast_url)
+    # Keep only drawable sections of the roads we show; forecasts are limited to these ids
+    geometry = [
+        feat for feat in geometry
+        if (feat.get("properties") or {}).get("roadNumber") in ROADS_OF_INTEREST
+        and (feat.get("geometry") or {}).get("type") == "MultiLineString"
+    ]
+    wanted_ids = {feat["properties"].get("id") for feat in geometry}
+
     if forecast_data is None:
         return {}, geometry
 
-    def first_valid_float(values):
-        for value in values:
-            if value is None:
-                continue
-            try:
-                number = float(value)
-            except (TypeError, ValueError):
-                continue
-            if math.isnan(number):
-                continue
-            return number
-        return None
-
     forecasts = {}
     for section in forecast_data.get("forecastSections", []):
         sid = section.get("id")
+        if sid not in wanted_ids:
+            continue
         fc = section.get("forecasts", [])
         if not fc:
             continue
         current = fc[0]
-        cond = (
-            current.get("overallRoadCondition")
-            or current.get("forecastConditionReason", {}).get("roadCondition")
-            or "UNKNOWN"
-        )
-
-        reason = current.get("forecastConditionReason") or {}
+        reason = current.get("forecastConditionReason") or _EMPTY
+        cond = current.get("overallRoadCondition") or reason.get("roadCondition") or "UNKNOWN"
         water_mm = first_valid_float(
             [
                 current.get("waterLayerThickness"),
@@ -178,50 +307,55 @@ def fetch_road_forecasts():
             "roadTemp": current.get("roadTemperature"),
             "airTemp": current.get("temperature"),
             "time": current.get("time"),
+            # Display string computed here, so map renders don't reparse it
+            "timeFmt": fmt_iso(current.get("time"), "%d.%m.%Y %H:%M") or current.get("time") or "",
             "waterOnRoad": water_mm,
             "snowOnRoad": snow_mm,
         }
     return forecasts, geometry
 
+def join_sections(geometry, forecasts):
+    """Pair each section feature with its forecast dict (None if missing) in one pass."""
+    return [(feat, forecasts.get(feat["properties"].get("id"))) for feat in geometry]
+
 # ----------------------------
 # 6) CONDITION HELPERS
 # ----------------------------
 HAZARDOUS = ("ICY", "SLIPP", "FROST", "SNOW", "SLUSH", "POOR")
+HAZARD_RE = re.compile("|".join(HAZARDOUS), re.IGNORECASE)
 
 def is_hazard(cond):
-    return bool(cond and any(h in cond.upper() for h in HAZARDOUS))
+    return bool(cond and HAZARD_RE.search(cond))
 
 # ----------------------------
 # 7) SUMMARY / TERMINAL TEST
 # ----------------------------
 def fetch_roads_summary():
     print("Checking road conditions and works in bounding box...\n")
-    geometry = fetch_road_geometry()
-    forecasts, _ = fetch_road_forecasts()
+    # Geometry from fetch_road_forecasts is already limited to ROADS_OF_INTEREST
+    forecasts, geometry = fetch_road_forecasts()
 
     print(f"🚧 Hazardous road conditions on {', '.join(map(str, ROADS_OF_INTEREST))}:")
     found = False
-    for feat in geometry:
-        props = feat.get("properties", {})
-        road_no = props.get("roadNumber")
-        if road_no in ROADS_OF_INTEREST:
-            cond = forecasts.get(props.get("id"), {}).get("cond")
-            temp = forecasts.get(props.get("id"), {}).get("roadTemp")
-            if cond and is_hazard(cond):
-                print(f"  • Road {road_no} — {props.get('description')} | {cond} | {temp}°C")
-                found = True
+    for feat, fc in join_sections(geometry, forecasts):
+        props = feat["properties"]
+        if fc and is_hazard(fc["cond"]):
+            print(f"  • Road {props.get('roadNumber')} — {props.get('description')} | {fc['cond']} | {fc['roadTemp']}°C")
+            found = True
     if not found:
         print("  ✅ No hazardous surface conditions.\n")
 
 # ----------------------------
 # 8) LIVE DATA FETCHERS
 # ----------------------------
+@ttl_cache(ROADS_CACHE_SECONDS, cache_if=bool)
 def fetch_weather_stations():
     """Return list of RWIS weather stations with live data."""
-    data = get_json("https://tie.digitraffic.fi/api/weather/v1/stations")
+    data = get_json_revalidated("https://tie.digitraffic.fi/api/weather/v1/stations")
     if not data:
         return []
-    stations = []
+    # Pick the stations first, then fetch their live data concurrently
+    selected = []
     for feat in data.get("features", []):
         props = feat.get("properties", {})
         sid = props.get("id")
@@ -230,13 +364,24 @@ def fetch_weather_stations():
         lon, lat = safe_coords(feat)
         if not inside_bbox(lon, lat):
             continue
+        selected.append((sid, props, lon, lat))
 
-        live = get_json(f"https://tie.digitraffic.fi/api/weather/v1/stations/{sid}/data")
+    lives = get_json_many([
+        f"https://tie.digitraffic.fi/api/weather/v1/stations/{sid}/data" for sid, *_ in selected
+    ])
+
+    stations = []
+    for (sid, props, lon, lat), live in zip(selected, lives):
         if not live:
             continue
 
-        vals = {s["name"]: s.get("value") for s in live.get("sensorValues", []) if "name" in s}
-        desc = {s["name"]: s.get("sensorValueDescriptionEn") for s in live.get("sensorValues", [])}
+        # One pass over the sensors fills both lookups
+        vals, desc = {}, {}
+        for sensor in live.get("sensorValues", ()):
+            name = sensor.get("name")
+            if name:
+                vals[name] = sensor.get("value")
+                desc[name] = sensor.get("sensorValueDescriptionEn")
 
         stations.append({
             "id": sid,
@@ -252,9 +397,10 @@ def fetch_weather_stations():
         })
     return stations
 
+@ttl_cache(ROADS_CACHE_SECONDS, cache_if=bool)
 def fetch_camera_stations():
     """Return list of selected camera stations with image URLs."""
-    data = get_json("https://tie.digitraffic.fi/api/weathercam/v1/stations")
+    data = get_json_revalidated("https://tie.digitraffic.fi/api/weathercam/v1/stations")
     if not data:
         return []
     cams = []
@@ -280,16 +426,19 @@ def fetch_camera_stations():
         })
     return cams
 
+# TMS sensor names vary per station (e.g. KESKINOPEUS_5MIN_LIUKUVA_SUUNTA1), so match by stem
+_SPEED_RE = re.compile("KESKINOPEUS", re.IGNORECASE)
+_VOLUME_RE = re.compile("OHITUKSET", re.IGNORECASE)
+
+@ttl_cache(ROADS_CACHE_SECONDS, cache_if=bool)
 def fetch_tms_stations():
     """Return list of TMS traffic stations with live speeds and volumes."""
-    data = get_json("https://tie.digitraffic.fi/api/tms/v1/stations")
+    data = get_json_revalidated("https://tie.digitraffic.fi/api/tms/v1/stations")
     if not data:
         return []
 
-    allowed = set(TMS_STATIONS)
-    allowed_str = {str(s) for s in TMS_STATIONS}
-
-    tms = []
+    # Pick the stations first, then fetch their live data concurrently
+    selected = []
     for feat in data.get("features", []):
         props = feat.get("properties", {})
         raw_id = props.get("id")
@@ -300,14 +449,14 @@ def fetch_tms_stations():
         for candidate in identifiers:
             if candidate is None:
                 continue
-            if candidate in allowed_str or candidate in allowed:
+            if candidate in TMS_STATIONS_STR or candidate in TMS_STATIONS:
                 include = True
                 break
             try:
                 as_int = int(candidate)
             except (TypeError, ValueError):
                 continue
-            if as_int in allowed:
+            if as_int in TMS_STATIONS:
                 include = True
                 break
         if not include:
@@ -321,7 +470,15 @@ def fetch_tms_stations():
         if station_identifier is None:
             continue
 
-        live = get_json(f"https://tie.digitraffic.fi/api/tms/v1/stations/{station_identifier}/data")
+        selected.append((station_identifier, tms_number, props, lon, lat))
+
+    lives = get_json_many([
+        f"https://tie.digitraffic.fi/api/tms/v1/stations/{station_identifier}/data"
+        for station_identifier, *_ in selected
+    ])
+
+    tms = []
+    for (station_identifier, tms_number, props, lon, lat), live in zip(selected, lives):
         if not live:
             continue
 
@@ -331,14 +488,8 @@ def fetch_tms_stations():
         else:
             values = {}
 
-        speed = next(
-            (float(v) for k, v in values.items() if re.search(r"KESKINOPEUS", k, re.I)),
-            None,
-        )
-        volume = next(
-            (float(v) for k, v in values.items() if re.search(r"OHITUKSET", k, re.I)),
-            None,
-        )
+        speed = next((float(v) for k, v in values.items() if _SPEED_RE.search(k)), None)
+        volume = next((float(v) for k, v in values.items() if _VOLUME_RE.search(k)), None)
 
         tms.append({
             "id": station_identifier,
@@ -352,76 +503,85 @@ def fetch_tms_stations():
 
     return tms
 
+WARNING_TITLES = {
+    "ROAD_WORK": "Road work",
+    "WEIGHT_RESTRICTION": "Weight restriction",
+    "TRAFFIC_ANNOUNCEMENT": "Traffic announcement",
+}
+
+def _warning_from_feature(feature):
+    """One traffic-message feature as a warning dict, or None if it is outside the bbox or empty."""
+    # Safety net: cheap, and keeps results right if the bbox params are ignored
+    lon, lat = safe_coords(feature)
+    if not inside_bbox(lon, lat):
+        return None
+    props = feature.get("properties", {})
+    s_type = props.get("situationType", "")
+    s_id = props.get("situationId", "")
+    anns = props.get("announcements", [])
+    if not anns:
+        return None
+    ann = anns[0]
+    loc_details = ann.get("locationDetails", {}).get("roadAddressLocation", {})
+    primary = loc_details.get("primaryPoint", {})
+    secondary = loc_details.get("secondaryPoint", {})
+    primary_name = primary.get("alertCLocation", {}).get("name", "")
+    secondary_name = secondary.get("alertCLocation", {}).get("name", "")
+    muni1 = primary.get("municipality", "")
+    muni2 = secondary.get("municipality", "")
+    tinfo = ann.get("timeAndDuration", {})
+    start_str = fmt_iso(tinfo.get("startTime"), "%d.%m.%Y")
+    end_str = fmt_iso(tinfo.get("endTime"), "%d.%m.%Y")
+    # First speed limit with both quantity and unit across all road work phases
+    restrict_text = next(
+        (
+            f"{res['quantity']} {res['unit']}"
+            for phase in ann.get("roadWorkPhases", ())
+            for r in phase.get("restrictions", ())
+            if r.get("type") == "SPEED_LIMIT"
+            for res in (r.get("restriction") or _EMPTY,)
+            if res.get("quantity") and res.get("unit")
+        ),
+        "—",
+    )
+    title = WARNING_TITLES.get(s_type, s_type.replace("_", " ").title() or "Traffic event")
+    if primary_name and secondary_name:
+        location_text = f"{primary_name} in {muni1} and {secondary_name} in {muni2}"
+    elif primary_name:
+        location_text = f"{primary_name} in {muni1}"
+    else:
+        location_text = f"Unknown road in {muni1 or muni2}"
+    return {
+        "id": s_id,
+        "type": title,
+        "location": location_text,
+        "start": start_str,
+        "end": end_str,
+        "restrictions": restrict_text,
+        "sender": ann.get("sender", "Unknown sender"),
+        "lat": lat,
+        "lon": lon,
+    }
+
+@ttl_cache(ROADS_CACHE_SECONDS, cache_if=bool)
 def fetch_warnings():
     """Fetch traffic warnings and roadworks within bounding box."""
-    url = "https://tie.digitraffic.fi/api/traffic-message/v1/messages"
-    data = get_json(url)
-    if data is None:
-        return []
+    # Ask the server for the bbox only, like the forecast-section URLs
+    url = (
+        f"https://tie.digitraffic.fi/api/traffic-message/v1/messages"
+        f"?xMin={X_MIN}&yMin={Y_MIN}&xMax={X_MAX}&yMax={Y_MAX}"
+    )
     results = []
-    for feature in data.get("features", []):
-        lon, lat = safe_coords(feature)
-        if not inside_bbox(lon, lat):
-            continue
-        props = feature.get("properties", {})
-        s_type = props.get("situationType", "")
-        s_id = props.get("situationId", "")
-        anns = props.get("announcements", [])
-        if not anns:
-            continue
-        ann = anns[0]
-        loc_details = ann.get("locationDetails", {}).get("roadAddressLocation", {})
-        primary = loc_details.get("primaryPoint", {})
-        secondary = loc_details.get("secondaryPoint", {})
-        primary_name = primary.get("alertCLocation", {}).get("name", "")
-        secondary_name = secondary.get("alertCLocation", {}).get("name", "")
-        muni1 = primary.get("municipality", "")
-        muni2 = secondary.get("municipality", "")
-        def fmt_time(ts):
-            if not ts:
-                return None
-            try:
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                return dt.strftime("%d.%m.%Y")
-            except Exception:
-                return None
-        tinfo = ann.get("timeAndDuration", {})
-        start_str = fmt_time(tinfo.get("startTime"))
-        end_str = fmt_time(tinfo.get("endTime"))
-        restrict_text = "—"
-        for phase in ann.get("roadWorkPhases", []):
-            for r in phase.get("restrictions", []):
-                if r.get("type") == "SPEED_LIMIT":
-                    res = r.get("restriction", {})
-                    qty = res.get("quantity")
-                    unit = res.get("unit")
-                    if qty and unit:
-                        restrict_text = f"{qty} {unit}"
-                        break
-            if restrict_text != "—":
-                break
-        title_map = {
-            "ROAD_WORK": "Road work",
-            "WEIGHT_RESTRICTION": "Weight restriction",
-            "TRAFFIC_ANNOUNCEMENT": "Traffic announcement",
-        }
-        title = title_map.get(s_type, s_type.replace("_", " ").title() or "Traffic event")
-        if primary_name and secondary_name:
-            location_text = f"{primary_name} in {muni1} and {secondary_name} in {muni2}"
-        elif primary_name:
-            location_text = f"{primary_name} in {muni1}"
-        else:
-            location_text = f"Unknown road in {muni1 or muni2}"
-        results.append({
-            "id": s_id,
-            "type": title,
-            "location": location_text,
-            "start": start_str,
-            "end": end_str,
-            "restrictions": restrict_text,
-            "sender": ann.get("sender", "Unknown sender"),
-            "coordinates": (lon, lat),
-        })
+    try:
+        for feature in iter_features(url):
+            warning = _warning_from_feature(feature)
+            if warning is not None:
+                results.append(warning)
+    except Exception as e:
+        # A stream cut off midway would otherwise be cached as a complete, shorter list;
+        # [] is not cached (cache_if=bool), so the next call retries
+        print(f"⚠️ Streaming error for {url}: {e}")
+        return []
     return results
 
 # ----------------------------
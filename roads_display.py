@@ -9,16 +9,23 @@ Generates an interactive map showing:
 - Bounding box and legend
 
 Uses data from roads.py and config.json.
+Call build_map() to fetch the data and get the folium.Map, or pass it
+the dict from fetch_map_data() to reuse already-fetched inputs.
 """
 
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import folium
-from folium.plugins import MiniMap
+import numpy as np
+from folium.plugins import FastMarkerCluster, MiniMap
 from folium import FeatureGroup, LayerControl
 from datetime import datetime
 
 from roads import (
     load_config,
     fetch_road_forecasts,
+    join_sections,
     fetch_warnings,
     fetch_weather_stations,
     fetch_camera_stations,
@@ -31,7 +38,6 @@ from trains import fetch_train_locations, get_station_coordinates
 # ----------------------------
 cfg = load_config()
 BOUNDING_BOX = cfg.get("BOUNDING_BOX", {})
-ROADS_OF_INTEREST = cfg.get("ROADS_OF_INTEREST", [])
 TRAIN_LINE = cfg.get("TRAIN_LINE", "R")
 TRAIN_STOPS = cfg.get("TRAIN_STOPS", [])
 STATIONS = cfg.get("STATIONS", {})
@@ -51,16 +57,30 @@ center_lon = (X_MIN + X_MAX) / 2
 # ----------------------------
 # 2) COLOR CLASSIFICATION
 # ----------------------------
+# Map colour classes (not roads.HAZARD_RE, which drives the text summary); "IC" also covers ICE / ICY
+SEVERITY_HAZARD_RE = re.compile("IC|FROST|SNOW|SLUSH|POOR", re.IGNORECASE)
+SEVERITY_WET_RE = re.compile("WET|MOIST", re.IGNORECASE)
+
 def classify_condition(cond_text: str) -> str:
     if not cond_text:
         return "NORMAL"
-    cond_text = cond_text.upper()
-    if any(k in cond_text for k in ["ICE", "IC", "FROST", "SNOW", "SLUSH", "POOR"]):
+    if SEVERITY_HAZARD_RE.search(cond_text):
         return "HAZARD"
-    if any(k in cond_text for k in ["WET", "MOIST"]):
+    if SEVERITY_WET_RE.search(cond_text):
         return "WET"
     return "NORMAL"
 
+def planar_lines(lines):
+    """
+    Drop the z (elevation) component from MultiLineString coordinates.
+    Slices each line as one NumPy array instead of unpacking every vertex;
+    2D lines are passed through untouched.
+    """
+    return [
+        np.asarray(line, dtype=np.float64)[:, :2].tolist() if line and len(line[0]) > 2 else line
+        for line in lines
+    ]
+
 def color_for_severity(sev: str) -> str:
     return {
         "HAZARD": "red",
@@ -69,31 +89,75 @@ def color_for_severity(sev: str) -> str:
     }.get(sev, "gray")
 
 # ----------------------------
-# 3) FETCH DATA
-# ----------------------------
-print("Fetching road forecasts and warnings...")
-forecasts, geometry = fetch_road_forecasts()
-warnings = fetch_warnings()
-print(f"  - Forecast sections: {len(geometry)}")
-print(f"  - Traffic warnings: {len(warnings)}")
-
-# ----------------------------
-# 4) CREATE MAP
-# ----------------------------
-m = folium.Map(location=[center_lat, center_lon], zoom_start=11, control_scale=True)
-MiniMap(toggle_display=True, position="bottomright").add_to(m)
-
-# Feature layers
-warnings_layer = FeatureGroup(name="🚧 Roadworks & Warnings", show=True)
-weather_layer = FeatureGroup(name="🌡 Weather Stations", show=True)
-camera_layer = FeatureGroup(name="📷 Cameras", show=True)
-tms_layer = FeatureGroup(name="🚗 Traffic Measurement", show=True)
-train_layer = FeatureGroup(name=f"🚆 {TRAIN_LINE}-line trains", show=True)
-
-# ----------------------------
-# 5) ADD MARKERS
+# 3) MARKER HELPERS
 # ----------------------------
-def add_marker(coords, tooltip_html, color, icon, prefix="fa"):
+# Tooltip HTML templates, filled with % once per feature
+WEATHER_TT = (
+    "🌡 <b>%(name)s</b><br>"
+    "Air: %(airTemp)s °C<br>"
+    "Road: %(roadTemp)s °C<br>"
+    "Wind: %(wind)s m/s<br>"
+    "Humidity: %(humidity)s %%<br>"
+    "Precipitation: %(precipitation)s<br>"
+    "Condition: %(roadCondition)s"
+)
+TMS_TT = "🚗 <b>%(name)s</b><br>Speed: %(speed)s km/h<br>Volume: %(volume)s veh/h"
+CAMERA_TT = "📷 <b>%s</b><br>%s"
+CAMERA_IMAGE_TT = (
+    "<div style='break-inside:avoid;'>"
+    "<img src='%s' style='width:100%%;display:block;border-radius:4px;'>"
+    "</div>"
+)
+WARNING_TT = (
+    "<b>%(type)s</b><br>"
+    "<b>Location:</b> %(location)s<br>"
+    "<b>Start:</b> %(start)s<br>"
+    "<b>Planned end:</b> %(end)s<br>"
+    "<b>Restrictions:</b> %(restrictions)s<br>"
+    "<b>ID:</b> %(id)s"
+)
+TRAIN_TT = "<b>%s %s</b><br>Speed: %s km/h"
+
+# Forecast tooltips, one variant per (has snow, has water) so no per-section concatenation
+_FORECAST_HEAD = (
+    "<b>Road %(road)s</b><br>"
+    "%(desc)s<br>"
+    "<b>Condition:</b> %(cond)s<br>"
+    "<b>Air T:</b> %(air)s °C<br>"
+    "<b>Road T:</b> %(road_t)s °C"
+)
+FORECAST_TT = {
+    (has_snow, has_water): (
+        _FORECAST_HEAD
+        + ("<br><b>Snow on road:</b> %(snow).1f mm" if has_snow else "")
+        + ("<br><b>Water on road:</b> %(water).1f mm" if has_water else "")
+        + "<br><b>Forecast:</b> %(time)s"
+    )
+    for has_snow in (False, True)
+    for has_water in (False, True)
+}
+
+# Below this many warnings, markers are added individually instead of clustered
+CLUSTER_MIN_MARKERS = 50
+
+# Roadwork icon, shared by the clustered and unclustered paths so both look the same
+WARNING_COLOR = "orange"
+WARNING_ICON = "wrench"
+
+# FastMarkerCluster callback: one orange wrench marker per [lat, lon, tooltip] row.
+# The icon is built once and shared by every marker.
+WARNING_MARKER_JS = """
+(function () {
+    var icon = L.AwesomeMarkers.icon({icon: '%s', prefix: 'fa', markerColor: '%s'});
+    return function (row) {
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+        marker.bindTooltip(row[2], {sticky: true});
+        return marker;
+    };
+})();
+""" % (WARNING_ICON, WARNING_COLOR)
+
+def add_marker(fmap, coords, tooltip_html, color, icon, prefix="fa"):
     if not coords:
         return
     tooltip_html = tooltip_html.replace("\n", "<br>")
@@ -101,302 +165,320 @@ def add_marker(coords, tooltip_html, color, icon, prefix="fa"):
         [coords["lat"], coords["lon"]],
         tooltip=folium.Tooltip(tooltip_html, sticky=True),
         icon=folium.Icon(color=color, icon=icon, prefix=prefix),
-    ).add_to(m)
+    ).add_to(fmap)
+
+def add_point_layer(layer, points, color, icon, prefix="fa"):
+    """
+    Add [lat, lon, tooltip_html] rows to `layer` as a single GeoJson of icon markers.
+    One FeatureCollection replaces a folium.Marker (plus its own JS) per point;
+    every point still gets the category's color and icon.
+    """
+    if not points:
+        return
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"tooltip": tooltip_html},
+        }
+        for lat, lon, tooltip_html in points
+    ]
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        marker=folium.Marker(icon=folium.Icon(color=color, icon=icon, prefix=prefix)),
+        tooltip=folium.GeoJsonTooltip(fields=["tooltip"], labels=False, sticky=True),
+    ).add_to(layer)
 
-# Home and Ainola markers (always visible)
-add_marker(HOME, HOME.get("tooltip", "Home"), color="blue", icon="home")
-add_marker(AINOLA, AINOLA.get("tooltip", "Ainola Parking"), color="green", icon="train")
 
 # ----------------------------
-# 6) DRAW ROAD FORECAST SECTIONS
+# 4) BUILD MAP
 # ----------------------------
-for feat in geometry:
-    props = feat.get("properties", {})
-    geom = feat.get("geometry", {})
-    road_num = props.get("roadNumber")
-    sec_id = props.get("id")
-    desc = props.get("description", "")
-
-    if road_num not in ROADS_OF_INTEREST:
-        continue
-    if geom.get("type") != "MultiLineString":
-        continue
-
-    cond_data = forecasts.get(sec_id, {})
-    cond = cond_data.get("cond", "UNKNOWN")
-    air_t = cond_data.get("airTemp", "?")
-    road_t = cond_data.get("roadTemp", "?")
-    water_mm = cond_data.get("waterOnRoad")
-    snow_mm = cond_data.get("snowOnRoad")
-    ftime = cond_data.get("time", "")
-
-    ftime_fmt = ""
-    if ftime:
-        try:
-            ftime_fmt = datetime.fromisoformat(ftime.replace("Z", "+00:00")).strftime("%d.%m.%Y %H:%M")
-        except Exception:
-            ftime_fmt = ftime
-
-    sev = classify_condition(cond)
-    color = color_for_severity(sev)
-
-    tooltip_html = (
-        f"<b>Road {road_num}</b><br>"
-        f"{desc}<br>"
-        f"<b>Condition:</b> {cond}<br>"
-        f"<b>Air T:</b> {air_t} °C<br>"
-        f"<b>Road T:</b> {road_t} °C"
-    )
-
-    if snow_mm is not None:
-        tooltip_html += f"<br><b>Snow on road:</b> {snow_mm:.1f} mm"
-    if water_mm is not None:
-        tooltip_html += f"<br><b>Water on road:</b> {water_mm:.1f} mm"
+def fetch_map_data() -> dict:
+    """
+    Fetch every source the map needs, concurrently (all independent I/O).
+    The returned dict can be cached or reused and passed to build_map().
+    """
+    print("Fetching road forecasts, warnings, sensors and trains...")
+    with ThreadPoolExecutor(max_workers=7) as pool:
+        forecasts_f = pool.submit(fetch_road_forecasts)
+        warnings_f = pool.submit(fetch_warnings)
+        weather_f = pool.submit(fetch_weather_stations)
+        cameras_f = pool.submit(fetch_camera_stations)
+        tms_f = pool.submit(fetch_tms_stations)
+        trains_f = pool.submit(fetch_train_locations, TRAIN_LINE)
+        stations_f = pool.submit(get_station_coordinates, tuple(TRAIN_STOPS)) if TRAIN_STOPS else None
+
+    forecasts, geometry = forecasts_f.result()
+    return {
+        "forecasts": forecasts,
+        "geometry": geometry,
+        "warnings": warnings_f.result(),
+        "weather": weather_f.result(),
+        "cameras": cameras_f.result(),
+        "tms": tms_f.result(),
+        "trains": trains_f.result(),
+        "stations": stations_f.result() if stations_f else {},
+    }
+
+
+def build_map(data: dict | None = None) -> folium.Map:
+    """
+    Return the finished folium map for `data` from fetch_map_data().
+    Fetches it first when not given. Nothing runs at import; callers decide
+    when (and how often) to build.
+    """
+    if data is None:
+        data = fetch_map_data()
+    forecasts, geometry = data["forecasts"], data["geometry"]
+    warnings = data["warnings"]
+    print(f"  - Forecast sections: {len(geometry)}")
+    print(f"  - Traffic warnings: {len(warnings)}")
+
+    # --- Create map ---
+    # Canvas renderer: forecast sections, the train line and stop circles paint into
+    # one <canvas>; icon markers (sensors, roadworks) stay regular marker elements
+    # instead of an SVG DOM node each
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=11, control_scale=True, prefer_canvas=True)
+    MiniMap(toggle_display=True, position="bottomright").add_to(m)
+
+    # Feature layers
+    warnings_layer = FeatureGroup(name="🚧 Roadworks & Warnings", show=True)
+    weather_layer = FeatureGroup(name="🌡 Weather Stations", show=True)
+    camera_layer = FeatureGroup(name="📷 Cameras", show=True)
+    tms_layer = FeatureGroup(name="🚗 Traffic Measurement", show=True)
+    train_layer = FeatureGroup(name=f"🚆 {TRAIN_LINE}-line trains", show=True)
+
+    # --- Add markers ---
+    # Home and Ainola markers (always visible)
+    add_marker(m, HOME, HOME.get("tooltip", "Home"), color="blue", icon="home")
+    add_marker(m, AINOLA, AINOLA.get("tooltip", "Ainola Parking"), color="green", icon="train")
+
+    # --- Draw road forecast sections ---
+    # geometry is already limited to MultiLineString sections of ROADS_OF_INTEREST.
+    # All sections go into one FeatureCollection; color and tooltip ride along as properties.
+    section_features = []
+    for feat, cond_data in join_sections(geometry, forecasts):
+        geom = feat.get("geometry", {})
+        # Nothing to draw: skip before parsing times and building the tooltip
+        if not geom.get("coordinates"):
+            continue
+        props = feat.get("properties", {})
+        road_num = props.get("roadNumber")
+        desc = props.get("description", "")
+
+        cond_data = cond_data or {}
+        cond = cond_data.get("cond", "UNKNOWN")
+        air_t = cond_data.get("airTemp", "?")
+        road_t = cond_data.get("roadTemp", "?")
+        water_mm = cond_data.get("waterOnRoad")
+        snow_mm = cond_data.get("snowOnRoad")
+        ftime_fmt = cond_data.get("timeFmt", "")
+
+        sev = classify_condition(cond)
+        color = color_for_severity(sev)
+
+        tooltip_html = FORECAST_TT[snow_mm is not None, water_mm is not None] % {
+            "road": road_num, "desc": desc, "cond": cond, "air": air_t, "road_t": road_t,
+            "snow": snow_mm, "water": water_mm, "time": ftime_fmt,
+        }
+
+        section_features.append({
+            "type": "Feature",
+            # Leaflet ignores elevation, so don't ship it in the page
+            "geometry": {"type": "MultiLineString", "coordinates": planar_lines(geom["coordinates"])},
+            "properties": {"color": color, "tooltip": tooltip_html},
+        })
+
+    if section_features:
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": section_features},
+            style_function=lambda feat: {"color": feat["properties"]["color"], "weight": 5, "opacity": 0.85},
+            tooltip=folium.GeoJsonTooltip(fields=["tooltip"], labels=False, sticky=True),
+        ).add_to(m)
 
-    tooltip_html += f"<br><b>Forecast:</b> {ftime_fmt}"
+    # --- Add roadworks / warnings ---
+    # fetch_warnings() already dropped features without coordinates or outside the bbox,
+    # so this is a single pass building [lat, lon, tooltip] rows for WARNING_MARKER_JS
+    warning_points = [[w["lat"], w["lon"], WARNING_TT % w] for w in warnings]
 
-    for segment in geom.get("coordinates", []):
-        path = [(lat, lon) for lon, lat, *_ in segment]
+    # Clustering only pays off for many markers; a handful are cheaper as plain markers
+    if len(warning_points) >= CLUSTER_MIN_MARKERS:
+        FastMarkerCluster(warning_points, callback=WARNING_MARKER_JS).add_to(warnings_layer)
+    else:
+        # Plain orange wrench markers, batched into one GeoJson layer
+        add_point_layer(warnings_layer, warning_points, WARNING_COLOR, WARNING_ICON)
+
+    # --- Add sensor layers ---
+
+    # Each category is one GeoJson layer of [lat, lon, tooltip] rows (see add_point_layer)
+
+    # 🌡 Weather stations
+    weather_points = [[ws["lat"], ws["lon"], WEATHER_TT % ws] for ws in data["weather"]]
+    add_point_layer(weather_layer, weather_points, "lightgreen", "cloud")
+
+    # 📷 Cameras
+    camera_points = []
+    for cam in data["cameras"]:
+        if cam["images"]:
+            image_items = "".join(CAMERA_IMAGE_TT % url for url in cam["images"])
+            images_markup = (
+                "<div style=\"display:grid;grid-template-columns:repeat(auto-fit,minmax(140px,1fr));"
+                "gap:4px;max-width:460px;\">"
+                f"{image_items}"
+                "</div>"
+            )
+            img_html = (
+                f"{images_markup}"
+                f"<small style='display:block;margin-top:4px;'>{len(cam['images'])} view(s)</small>"
+            )
+        else:
+            img_html = "<i>No image available</i>"
+
+        camera_points.append([cam["lat"], cam["lon"], CAMERA_TT % (cam["name"], img_html)])
+    add_point_layer(camera_layer, camera_points, "purple", "camera")
+
+    # 🚗 TMS stations
+    tms_points = [[tms["lat"], tms["lon"], TMS_TT % tms] for tms in data["tms"]]
+    add_point_layer(tms_layer, tms_points, "red", "car")
+
+    # --- Add train line overlay ---
+    station_coords = data["stations"]
+
+    ordered_points = []
+    for stop_code in TRAIN_STOPS:
+        coords = station_coords.get(stop_code.upper())
+        if not coords:
+            continue
+        ordered_points.append((coords["lat"], coords["lon"], STATIONS.get(stop_code, stop_code), stop_code))
+
+    if len(ordered_points) >= 2:
         folium.PolyLine(
-            locations=path,
+            locations=[(lat, lon) for lat, lon, *_ in ordered_points],
             weight=5,
-            color=color,
-            opacity=0.85,
-            tooltip=folium.Tooltip(tooltip_html, sticky=True),
-        ).add_to(m)
-
-# ----------------------------
-# 7) ADD ROADWORKS / WARNINGS
-# ----------------------------
-for w in warnings:
-    lon, lat = w.get("coordinates", (None, None))
-    if not (lat and lon):
-        continue
-
-    tooltip_html = (
-        f"<b>{w['type']}</b><br>"
-        f"<b>Location:</b> {w['location']}<br>"
-        f"<b>Start:</b> {w['start']}<br>"
-        f"<b>Planned end:</b> {w['end']}<br>"
-        f"<b>Restrictions:</b> {w['restrictions']}<br>"
-        f"<b>ID:</b> {w['id']}"
-    )
-
-    folium.Marker(
-        [lat, lon],
-        icon=folium.Icon(color="orange", icon="wrench", prefix="fa"),
-        tooltip=folium.Tooltip(tooltip_html, sticky=True),
-    ).add_to(warnings_layer)
-
-# ----------------------------
-# 8) ADD SENSOR LAYERS
-# ----------------------------
-print("Fetching weather, camera, and TMS sensor data...")
-
-# 🌡 Weather stations
-for ws in fetch_weather_stations():
-    tooltip_html = (
-        f"🌡 <b>{ws['name']}</b><br>"
-        f"Air: {ws['airTemp']} °C<br>"
-        f"Road: {ws['roadTemp']} °C<br>"
-        f"Wind: {ws['wind']} m/s<br>"
-        f"Humidity: {ws['humidity']} %<br>"
-        f"Precipitation: {ws['precipitation']}<br>"
-        f"Condition: {ws['roadCondition']}"
-    )
-    folium.Marker(
-        [ws["lat"], ws["lon"]],
-        tooltip=folium.Tooltip(tooltip_html, sticky=True),
-        icon=folium.Icon(color="lightgreen", icon="cloud", prefix="fa")
-    ).add_to(weather_layer)
-
-# 📷 Cameras
-for cam in fetch_camera_stations():
-    if cam["images"]:
-        image_items = "".join(
-            f"<div style='break-inside:avoid;'>"
-            f"<img src='{url}' style='width:100%;display:block;border-radius:4px;'>"
-            "</div>"
-            for url in cam["images"]
-        )
-        images_markup = (
-            "<div style=\"display:grid;grid-template-columns:repeat(auto-fit,minmax(140px,1fr));"
-            "gap:4px;max-width:460px;\">"
-            f"{image_items}"
-            "</div>"
-        )
-        img_html = (
-            f"{images_markup}"
-            f"<small style='display:block;margin-top:4px;'>{len(cam['images'])} view(s)</small>"
-        )
+            color="#006400",
+            opacity=0.9,
+            tooltip=f"{TRAIN_LINE}-line track",
+        ).add_to(train_layer)
+
+    for lat, lon, name, code in ordered_points:
+        folium.CircleMarker(
+            location=(lat, lon),
+            radius=5,
+            color="#004d26",
+            fill=True,
+            fill_color="#2e8b57",
+            fill_opacity=0.95,
+            tooltip=folium.Tooltip(f"{name} ({code})", sticky=True),
+        ).add_to(train_layer)
+
+    train_positions = data["trains"]
+
+    if train_positions:
+        print(f"  - Live trains fetched: {len(train_positions)} for line {TRAIN_LINE}")
     else:
-        img_html = "<i>No image available</i>"
-
-    tooltip_html = f"📷 <b>{cam['name']}</b><br>{img_html}"
-    folium.Marker(
-        [cam["lat"], cam["lon"]],
-        tooltip=folium.Tooltip(tooltip_html, sticky=True),
-        icon=folium.Icon(color="purple", icon="camera", prefix="fa")
-    ).add_to(camera_layer)
-
-# 🚗 TMS stations
-for tms in fetch_tms_stations():
-    speed = tms.get("speed")
-    volume = tms.get("volume")
-    tooltip_html = (
-        f"🚗 <b>{tms['name']}</b><br>"
-        f"Speed: {speed} km/h<br>"
-        f"Volume: {volume} veh/h"
-    )
-    folium.Marker(
-        [tms["lat"], tms["lon"]],
-        tooltip=folium.Tooltip(tooltip_html, sticky=True),
-        icon=folium.Icon(color="red", icon="car", prefix="fa")
-    ).add_to(tms_layer)
-
-# ----------------------------
-# 9) ADD TRAIN LINE OVERLAY
-# ----------------------------
-station_coords = get_station_coordinates(tuple(TRAIN_STOPS)) if TRAIN_STOPS else {}
-
-ordered_points = []
-for stop_code in TRAIN_STOPS:
-    data = station_coords.get(stop_code.upper())
-    if not data:
-        continue
-    ordered_points.append((data["lat"], data["lon"], STATIONS.get(stop_code, stop_code), stop_code))
-
-if len(ordered_points) >= 2:
+        print(f"  - Live trains fetched: 0 for line {TRAIN_LINE}")
+
+    if ordered_points:
+        lats = [pt[0] for pt in ordered_points]
+        lons = [pt[1] for pt in ordered_points]
+        min_lat, max_lat = min(lats), max(lats)
+        min_lon, max_lon = min(lons), max(lons)
+
+        lat_pad = max(0.02, (max_lat - min_lat) * 0.1)
+        lon_pad = max(0.02, (max_lon - min_lon) * 0.1)
+
+        def in_relevant_area(lon, lat):
+            return (
+                (min_lon - lon_pad) <= lon <= (max_lon + lon_pad)
+                and (min_lat - lat_pad) <= lat <= (max_lat + lat_pad)
+            )
+    else:
+        def in_relevant_area(lon, lat):
+            return X_MIN <= lon <= X_MAX and Y_MIN <= lat <= Y_MAX
+
+    for train in train_positions:
+        lat = train.get("lat")
+        lon = train.get("lon")
+        if lat is None or lon is None or not in_relevant_area(lon, lat):
+            continue
+
+        speed = train.get("speed")
+        ts = train.get("timestamp")
+        ts_fmt = ""
+        if ts:
+            try:
+                ts_fmt = datetime.fromisoformat(ts.replace("Z", "+00:00")).strftime("%d.%m.%Y %H:%M:%S")
+            except Exception:
+                ts_fmt = ts
+
+        tooltip_html = TRAIN_TT % (TRAIN_LINE, train.get("trainNumber"), speed if speed is not None else "—")
+
+        if ts_fmt:
+            tooltip_html += f"<br>Updated: {ts_fmt}"
+
+        folium.Marker(
+            [lat, lon],
+            tooltip=folium.Tooltip(tooltip_html, sticky=True),
+            icon=folium.Icon(color="darkgreen", icon="train", prefix="fa"),
+        ).add_to(train_layer)
+
+
+    # Add all feature layers to map
+    warnings_layer.add_to(m)
+    weather_layer.add_to(m)
+    camera_layer.add_to(m)
+    tms_layer.add_to(m)
+    train_layer.add_to(m)
+    LayerControl(collapsed=False).add_to(m)
+
+    # --- Add bounding box frame (red) ---
+    bbox_coords = [
+        (Y_MIN, X_MIN),
+        (Y_MIN, X_MAX),
+        (Y_MAX, X_MAX),
+        (Y_MAX, X_MIN),
+        (Y_MIN, X_MIN),
+    ]
     folium.PolyLine(
-        locations=[(lat, lon) for lat, lon, *_ in ordered_points],
-        weight=5,
-        color="#006400",
+        locations=bbox_coords,
+        color="red",
+        weight=3,
         opacity=0.9,
-        tooltip=f"{TRAIN_LINE}-line track",
-    ).add_to(train_layer)
-
-for lat, lon, name, code in ordered_points:
-    folium.CircleMarker(
-        location=(lat, lon),
-        radius=5,
-        color="#004d26",
-        fill=True,
-        fill_color="#2e8b57",
-        fill_opacity=0.95,
-        tooltip=folium.Tooltip(f"{name} ({code})", sticky=True),
-    ).add_to(train_layer)
-
-train_positions = fetch_train_locations(TRAIN_LINE)
-
-if train_positions:
-    print(f"  - Live trains fetched: {len(train_positions)} for line {TRAIN_LINE}")
-else:
-    print(f"  - Live trains fetched: 0 for line {TRAIN_LINE}")
-
-if ordered_points:
-    lats = [pt[0] for pt in ordered_points]
-    lons = [pt[1] for pt in ordered_points]
-    min_lat, max_lat = min(lats), max(lats)
-    min_lon, max_lon = min(lons), max(lons)
-
-    lat_pad = max(0.02, (max_lat - min_lat) * 0.1)
-    lon_pad = max(0.02, (max_lon - min_lon) * 0.1)
-
-    def in_relevant_area(lon, lat):
-        return (
-            (min_lon - lon_pad) <= lon <= (max_lon + lon_pad)
-            and (min_lat - lat_pad) <= lat <= (max_lat + lat_pad)
-        )
-else:
-    def in_relevant_area(lon, lat):
-        return X_MIN <= lon <= X_MAX and Y_MIN <= lat <= Y_MAX
-
-for train in train_positions:
-    lat = train.get("lat")
-    lon = train.get("lon")
-    if lat is None or lon is None or not in_relevant_area(lon, lat):
-        continue
-
-    speed = train.get("speed")
-    ts = train.get("timestamp")
-    ts_fmt = ""
-    if ts:
-        try:
-            ts_fmt = datetime.fromisoformat(ts.replace("Z", "+00:00")).strftime("%d.%m.%Y %H:%M:%S")
-        except Exception:
-            ts_fmt = ts
-
-    tooltip_html = (
-        f"<b>{TRAIN_LINE} {train.get('trainNumber')}</b><br>"
-        f"Speed: {speed if speed is not None else '—'} km/h"
-    )
-
-    if ts_fmt:
-        tooltip_html += f"<br>Updated: {ts_fmt}"
-
-    folium.Marker(
-        [lat, lon],
-        tooltip=folium.Tooltip(tooltip_html, sticky=True),
-        icon=folium.Icon(color="darkgreen", icon="train", prefix="fa"),
-    ).add_to(train_layer)
-
-
-# Add all feature layers to map
-warnings_layer.add_to(m)
-weather_layer.add_to(m)
-camera_layer.add_to(m)
-tms_layer.add_to(m)
-train_layer.add_to(m)
-LayerControl(collapsed=False).add_to(m)
+        dash_array="5,5",
+        tooltip="Configured bounding box area",
+    ).add_to(m)
 
-# ----------------------------
-# 10) ADD BOUNDING BOX FRAME (RED)
-# ----------------------------
-bbox_coords = [
-    (Y_MIN, X_MIN),
-    (Y_MIN, X_MAX),
-    (Y_MAX, X_MAX),
-    (Y_MAX, X_MIN),
-    (Y_MIN, X_MIN),
-]
-folium.PolyLine(
-    locations=bbox_coords,
-    color="red",
-    weight=3,
-    opacity=0.9,
-    dash_array="5,5",
-    tooltip="Configured bounding box area",
-).add_to(m)
+    # --- Legend ---
+    legend_html = """
+    <div style="
+    position: absolute;
+    bottom: 30px; left: 30px; width: 130px;
+    background-color: white;
+    border:2px solid grey;
+    z-index:9999;
+    font-size:14px;
+    padding:10px;">
+    <b>Legend</b><br>
+    <svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
+    style="stroke:red;stroke-width:4"/></svg> Hazardous<br>
+    <svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
+    style="stroke:orange;stroke-width:4"/></svg> Wet / Moist<br>
+    <svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
+    style="stroke:#4a90e2;stroke-width:4"/></svg> Normal<br>
+    <svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
+    style="stroke:#006400;stroke-width:4"/></svg> R-line track<br>
+    </div>
+    """
+    m.get_root().html.add_child(folium.Element(legend_html))
+
+    return m
 
-# ----------------------------
-# 11) LEGEND
-# ----------------------------
-legend_html = """
-<div style="
-position: absolute;
-bottom: 30px; left: 30px; width: 130px;
-background-color: white;
-border:2px solid grey;
-z-index:9999;
-font-size:14px;
-padding:10px;">
-<b>Legend</b><br>
-<svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
-style="stroke:red;stroke-width:4"/></svg> Hazardous<br>
-<svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
-style="stroke:orange;stroke-width:4"/></svg> Wet / Moist<br>
-<svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
-style="stroke:#4a90e2;stroke-width:4"/></svg> Normal<br>
-<svg height="10" width="20"><line x1="0" y1="5" x2="20" y2="5"
-style="stroke:#006400;stroke-width:4"/></svg> R-line track<br>
-</div>
-"""
-m.get_root().html.add_child(folium.Element(legend_html))
 
 # ----------------------------
-# 12) SAVE MAP
+# 5) SAVE MAP
 # ----------------------------
 if __name__ == "__main__":
+    m = build_map()
     m.save("roads_map.html")
     print("✅ Saved map as roads_map.html — open it in your browser to preview.")
 
@@ -0,0 +1,51 @@
+"""fetch_road_forecasts on a stubbed Digitraffic payload (no network)."""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import roads  # noqa: E402
+
+
+def _section(sid, road, geom_type="MultiLineString"):
+    return {
+        "properties": {"id": sid, "roadNumber": road},
+        "geometry": {"type": geom_type, "coordinates": [[[25.0, 60.3, 0.0], [25.1, 60.4, 0.0]]]},
+    }
+
+
+def test_fetch_road_forecasts_stubbed(monkeypatch):
+    road = next(iter(roads.ROADS_OF_INTEREST))
+    geometry = {"features": [
+        _section("A", road),
+        _section("B", road, geom_type="Point"),  # not drawable
+        _section("C", -1),                        # not a road of interest
+    ]}
+    forecasts = {"forecastSections": [
+        {"id": "A", "forecasts": [{
+            "overallRoadCondition": "WET",
+            "roadTemperature": 1.5,
+            "temperature": 2.0,
+            "time": "2025-01-01T06:00:00Z",
+            "waterLayerThickness": None,
+            "waterOnRoad": "0.4",
+            "forecastConditionReason": {"snowOnRoad": 2},
+        }]},
+        {"id": "C", "forecasts": [{"overallRoadCondition": "ICY"}]},
+    ]}
+    monkeypatch.setattr(roads, "get_json_many", lambda urls, **kw: [geometry, forecasts])
+    roads.fetch_road_forecasts.cache_clear()
+
+    by_id, sections = roads.fetch_road_forecasts()
+
+    assert [f["properties"]["id"] for f in sections] == ["A"]
+    assert set(by_id) == {"A"}
+    a = by_id["A"]
+    assert a["cond"] == "WET"
+    assert a["waterOnRoad"] == 0.4
+    assert a["snowOnRoad"] == 2.0
+    assert a["timeFmt"] == "01.01.2025 06:00"
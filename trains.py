@@ -14,6 +14,7 @@ Version: 2025-10-29
 # ----------------------------
 # 1) IMPORTS
 # ----------------------------
+import heapq
 import requests
 from datetime import datetime, timedelta, timezone
 from requests.exceptions import ReadTimeout, ConnectionError
@@ -23,6 +24,13 @@ import os
 import time
 from functools import lru_cache
 
+from http_utils import get_session, ttl_cache
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - orjson optional, fall back to stdlib json
+    orjson = None
+
 # ----------------------------
 # 2) CONFIGURATION
 # ----------------------------
@@ -31,13 +39,18 @@ import os, json, zoneinfo
 # Determine config path relative to this file
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
 
+@lru_cache(maxsize=1)
 def load_config():
     """
     Load configuration shared by all modules.
     Expects config.json generated by config.py.
+    Read once per process; callers share the dict, so treat it as read-only.
     """
     if not os.path.exists(CONFIG_PATH):
         raise FileNotFoundError("⚠️ config.json not found — run config.py first.")
+    if orjson:
+        with open(CONFIG_PATH, "rb") as f:
+            return orjson.loads(f.read())
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -58,6 +71,14 @@ HEADERS = {
     "Digitraffic-User": cfg.get("USER_AGENT", "Birgir-ainola-dashboard/1.0")
 }
 
+# Pooled session shared with roads/weather (see http_utils); Digitraffic
+# headers are passed per request so they don't leak to other hosts.
+SESSION = get_session()
+
+# Station windows are reused for this many seconds (both directions and quick reruns)
+STATION_WINDOW_TTL = 20
+STATION_METADATA_TTL = 24 * 60 * 60  # station list practically never changes
+
 STATIONS_METADATA_URL = "https://rata.digitraffic.fi/api/v1/metadata/stations"
 TRAIN_LOCATIONS_GEOJSON_URL = "https://rata.digitraffic.fi/api/v1/train-locations.geojson/latest"
 # Digitraffic moved their GraphQL endpoint under a nested /graphql path in 2024.
@@ -70,10 +91,12 @@ TRAIN_LOCATIONS_GRAPHQL_URL = "https://rata.digitraffic.fi/api/v2/graphql/graphq
 # ----------------------------
 # 3) TIME HELPERS
 # ----------------------------
+@lru_cache(maxsize=2048)
 def parse_time(ts: str) -> datetime:
-    """Convert ISO8601 string like '2024-01-26T12:05:00.000Z' → timezone-aware UTC datetime."""
+    """Convert ISO8601 string like '2024-01-26T12:05:00.000Z' → timezone-aware UTC datetime (memoized)."""
     return datetime.fromisoformat(ts.replace("Z", "+00:00"))
 
+@lru_cache(maxsize=2048)
 def format_hki(dt: datetime) -> str:
     """Format datetime to Helsinki local time HH:MM."""
     return dt.astimezone(TZ).strftime("%H:%M")
@@ -85,9 +108,9 @@ def get_json(url, retries=2, timeout=6):
     """Safely fetch JSON payload from Digitraffic with retry logic."""
     for attempt in range(retries + 1):
         try:
-            response = requests.get(url, headers=HEADERS, timeout=timeout)
+            response = SESSION.get(url, headers=HEADERS, timeout=timeout)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content) if orjson else response.json()
         except (ConnectionError, ReadTimeout):
             if attempt == retries:
                 return None
@@ -96,30 +119,52 @@ def get_json(url, retries=2, timeout=6):
             return None
 
 
-def fetch_station_window(station_code: str, before=PAST_MINUTES, after=FUTURE_MINUTES, limit=500, retries=2):
+def fetch_station_window(station_code: str, before=PAST_MINUTES, after=FUTURE_MINUTES, limit=500, retries=2,
+                         strict=False):
     """
     Fetch trains from Digitraffic API for a specific station.
-    Retries automatically if network timeout occurs.
+    Results are reused for STATION_WINDOW_TTL seconds; failures are not.
+    strict=True re-raises network errors instead of returning [], so callers
+    that cache the result can tell "no trains" from "fetch failed".
+    """
+    bucket = int(time.time() // STATION_WINDOW_TTL)
+    try:
+        return _fetch_station_window(station_code, before, after, limit, retries, bucket)
+    except (ConnectionError, ReadTimeout):
+        # lru_cache doesn't store exceptions, so the next call retries the API
+        if strict:
+            raise
+        return []
+
+
+@lru_cache(maxsize=16)
+def _fetch_station_window(station_code, before, after, limit, retries, _bucket):
+    """
+    Uncached fetch behind fetch_station_window (_bucket keys the TTL).
+    Retries automatically if network timeout occurs, then re-raises so the
+    failure isn't cached as an empty window.
     """
     url = (
         f"https://rata.digitraffic.fi/api/v1/live-trains/station/{station_code}"
         f"?departing_trains={limit}&minutes_before_departure={before}&minutes_after_departure={after}"
+        # Only commuter trains can match TRAIN_LINE; let the server drop the rest
+        "&train_categories=Commuter"
     )
 
     for attempt in range(retries + 1):
         try:
-            r = requests.get(url, headers=HEADERS, timeout=6)
+            r = SESSION.get(url, headers=HEADERS, timeout=6)
             r.raise_for_status()
-            return r.json()
+            return orjson.loads(r.content) if orjson else r.json()
         except (ConnectionError, ReadTimeout):
             if attempt == retries:
-                return []
+                raise
             time.sleep(0.4)  # short delay before retry
 
 
-@lru_cache(maxsize=1)
+@ttl_cache(STATION_METADATA_TTL, maxsize=1, cache_if=bool)
 def _station_metadata():
-    """Fetch metadata for all Finnish railway stations (cached)."""
+    """Fetch metadata for all Finnish railway stations (cached for a day; failures are retried)."""
     data = get_json(STATIONS_METADATA_URL)
     if not data:
         return []
@@ -176,18 +221,15 @@ def fetch_live_trains_graphql(train_line: str = TRAIN_LINE):
     }}
     """
 
-    headers = dict(HEADERS)
-    headers.setdefault("Content-Type", "application/json")
-
     try:
-        response = requests.post(
+        response = SESSION.post(
             TRAIN_LOCATIONS_GRAPHQL_URL,
             json={"query": query},
-            headers=headers,
+            headers=HEADERS,
             timeout=10,
         )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content) if orjson else response.json()
     except Exception as exc:
         print(f"⚠️ Failed to fetch {line}-line trains via GraphQL: {exc}")
         return []
@@ -343,34 +385,53 @@ def extract_best_time(row):
     else:
         return f"{format_hki(sched)}", sched
 
-def get_trains(origin: str, destination: str):
+def find_route_departure(rows, origin: str, destination: str):
+    """
+    Return the origin DEPARTURE row if the train later ARRIVEs at destination, else None.
+    Single walk: the first destination ARRIVAL decides, so no indices are needed.
+    """
+    dep = None
+    for r in rows:
+        kind = r["type"]
+        if kind == "DEPARTURE":
+            if dep is None and r["stationShortCode"] == origin:
+                dep = r
+        elif kind == "ARRIVAL" and r["stationShortCode"] == destination:
+            # None here means the train reaches destination before origin
+            return dep
+    return None
+
+def get_trains(origin: str, destination: str, limit=None, strict=False):
     """
     Returns the next commuter trains from origin to destination.
     Output: list of tuples (sched_time, trainNumber, time_text, best_dt, platform, rows)
+    limit: keep only the N earliest (partial sort); None returns all.
+    strict: raise on network failure instead of returning [] (see fetch_station_window).
     """
-    trains = fetch_station_window(origin)
-    now_utc = datetime.now(timezone.utc)
-    results = []
+    trains = fetch_station_window(origin, strict=strict)
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=PAST_MINUTES)
 
-    for tr in trains:
-        if tr.get("commuterLineID") != TRAIN_LINE:
-            continue
+    def _iter_route():
+        for tr in trains:
+            if tr.get("commuterLineID") != TRAIN_LINE:
+                continue
 
-        rows = tr["timeTableRows"]
-        dep = next((r for r in rows if r["stationShortCode"] == origin and r["type"] == "DEPARTURE"), None)
-        arr = next((r for r in rows if r["stationShortCode"] == destination and r["type"] == "ARRIVAL"), None)
-        if not dep or not arr or rows.index(dep) >= rows.index(arr):
-            continue
+            rows = tr["timeTableRows"]
+            dep = find_route_departure(rows, origin, destination)
+            if dep is None:
+                continue
 
-        sched_time = parse_time(dep["scheduledTime"])
-        if sched_time < now_utc - timedelta(minutes=PAST_MINUTES):
-            continue
+            sched_time = parse_time(dep["scheduledTime"])
+            if sched_time < cutoff:
+                continue
 
-        text, best = extract_best_time(dep)
-        platform = dep.get("commercialTrack", "—")
-        results.append((sched_time, tr["trainNumber"], text, best, platform, rows))
+            text, best = extract_best_time(dep)
+            platform = dep.get("commercialTrack", "—")
+            yield (sched_time, tr["trainNumber"], text, best, platform, rows)
 
-    return sorted(results, key=lambda x: x[0])
+    if limit is None:
+        return sorted(_iter_route(), key=lambda x: x[0])
+    return heapq.nsmallest(limit, _iter_route(), key=lambda x: x[0])
 
 # ----------------------------
 # 6) STATION HELPERS
@@ -387,7 +448,7 @@ def final_destination_name(rows, station_names: dict) -> str:
 def check_digitraffic_status(endpoint_name="Rail /api/v1/live-trains"):
     """Check API status page for service health."""
     try:
-        r = requests.get("https://status.digitraffic.fi/api/v2/components.json", timeout=4)
+        r = SESSION.get("https://status.digitraffic.fi/api/v2/components.json", timeout=4)
         if r.status_code != 200:
             return None
         for comp in r.json().get("components", []):
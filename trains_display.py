@@ -3,7 +3,7 @@ trains_display.py
 -----------------
 UI-neutral display for R-line trains.
 
-- Uses trains.py (get_trains, load_config)
+- Uses trains.py (get_trains, fetch_station_window, load_config)
 - Returns HTML (no Streamlit imports)
 - Focus column (morning: Ainola→Helsinki, afternoon: Helsinki→Ainola)
   gets a light grey text-tight highlight on the next train.
@@ -12,11 +12,11 @@ UI-neutral display for R-line trains.
 - Added: Typical commute trains section at bottom
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time as dtime, timezone, timedelta
 from io import StringIO
-import zoneinfo
 
-from trains import get_trains, load_config
+from trains import TZ, fetch_station_window, find_route_departure, get_trains, load_config
 
 
 # ----------------------------
@@ -30,12 +30,10 @@ TRAIN_LINE = cfg.get("TRAIN_LINE", "R")
 ORIGIN = HOME_STATIONS.get("origin", "AIN")
 DEST   = HOME_STATIONS.get("destination", "HKI")
 
-TZ = zoneinfo.ZoneInfo("Europe/Helsinki")
-
 # ----------------------------
 # 2) HELPERS
 # ----------------------------
-def enrich_and_filter(tr_list):
+def enrich_and_filter(tr_list, now_utc=None):
     """
     Filter past trains and compute minutes to departure.
     Input from trains.get_trains():
@@ -43,23 +41,24 @@ def enrich_and_filter(tr_list):
     Output:
       (sched_time, num, text, best_dt, platform, rows, mins_until)
     """
-    now_utc = datetime.now(timezone.utc)
+    now_ts = (now_utc or datetime.now(timezone.utc)).timestamp()
     future = []
     for sched_time, num, text, best_dt, platform, rows in tr_list:
         best_dt = best_dt or sched_time
-        mins = int((best_dt - now_utc).total_seconds() / 60)
+        # Plain float math instead of a timedelta per train
+        mins = int((best_dt.timestamp() - now_ts) / 60)
         if mins >= 0:
             future.append((sched_time, num, text, best_dt, platform, rows, mins))
     future.sort(key=lambda t: t[3])  # by best_dt
     return future[:5]
 
-def filter_by_time(tr_list, target_hour, target_minute):
+def filter_by_time(tr_list, target_hour, target_minute, now_hki=None):
     """
     Filter trains to those departing at or after target time.
     Handles next-day wrapping if target time has passed.
     Returns list of (sched_time, num, text, best_dt, platform, rows).
     """
-    now_hki = datetime.now(TZ)
+    now_hki = now_hki or datetime.now(TZ)
     target_time = now_hki.replace(hour=target_hour, minute=target_minute, second=0, microsecond=0)
     
     # If target time has passed today, look for tomorrow
@@ -73,16 +72,21 @@ def filter_by_time(tr_list, target_hour, target_minute):
                 if st >= target_utc]
     return filtered[:5]
 
-def active_direction_now():
+def active_direction_now(now_hki=None):
     """
     Morning emphasis (Ainola→Helsinki) until 12:00.
     Afternoon emphasis (Helsinki→Ainola) 12:00–18:30.
     Returns (active_left, active_right).
     """
-    now_local = datetime.now(TZ).time()
+    now_local = (now_hki or datetime.now(TZ)).time()
     focus_return = dtime(12, 0) <= now_local < dtime(18, 30)
     return (not focus_return, focus_return)
 
+# Row markup, filled with str.format per train (styles live in the page <style> block)
+_DETAILS_TMPL = "<br><span class='train-details'>{platform_text}</span>"
+_ROW_TMPL = "<div class='train-row'>{body}</div>"
+_HIGHLIGHT_TMPL = "<span class='next-train-box'>{body}</span>"
+
 def format_row(dest_name, num, text, platform, mins_until=None,
                show_details=False, highlight_bg=False, bold_only=False):
     """
@@ -93,64 +97,55 @@ def format_row(dest_name, num, text, platform, mins_until=None,
       - highlight_bg: focus column's first train → grey box wraps both lines
       - bold_only: inactive column's first train → bold main line only
     """
-    main_text = f"To {dest_name} ({TRAIN_LINE} {num}) — {text}"
-
     details = ""
     if show_details:
         platform_text = f"Platform {platform}"
         if mins_until is not None:
             platform_text += f" • departs in {mins_until} min"
-        details = (
-            "<br><span style='font-size:13px; opacity:0.8;'>"
-            f"{platform_text}"
-            "</span>"
-        )
+        details = _DETAILS_TMPL.format(platform_text=platform_text)
 
-    # Case 1: highlighted (focus column)
+    main = f"To {dest_name} ({TRAIN_LINE} {num}) — {text}"
+    if highlight_bg or bold_only:
+        main = f"<b>{main}</b>"
+    body = main + details
     if highlight_bg:
-        return (
-            "<div style='margin-bottom:4px;'>"
-            "<span style='background-color:#e9e9e9; border-radius:4px; padding:1px 6px; display:inline-block;'>"
-            f"<b>{main_text}</b>"
-            f"{details}"
-            "</span>"
-            "</div>"
-        )
+        # Focus column's first train gets the grey box around both lines
+        body = _HIGHLIGHT_TMPL.format(body=body)
+    return _ROW_TMPL.format(body=body)
 
-    # Case 2: inactive column's first train (bold main line only)
-    elif bold_only:
-        return (
-            "<div style='margin-bottom:4px;'>"
-            f"<b>{main_text}</b>"
-            f"{details}"
-            "</div>"
-        )
-
-    # Case 3: all other trains
-    else:
-        return (
-            "<div style='margin-bottom:4px;'>"
-            f"{main_text}"
-            f"{details}"
-            "</div>"
-        )
+def column_html(heading, rows_html, empty_text, heading_style=""):
+    """One train column as a single string: heading, then the joined rows or a placeholder."""
+    body = rows_html or f"<p><i>{empty_text}</i></p>"
+    return f"<div><h4{heading_style}>{heading}</h4>{body}</div>"
 
 # ----------------------------
 # 3) RENDER
 # ----------------------------
-def render_trains_html():
+def render_trains_html(strict=False):
     """
     Returns an HTML block with two sections:
     1. Current trains (two columns, time-based highlighting)
     2. Typical commute trains (two columns, fixed times: 07:00 and 15:00)
+    strict=True raises if any fetch fails instead of rendering empty columns,
+    so cached callers never keep a board built from failed fetches.
     """
-    # Fetch and prepare current data
-    to_city = enrich_and_filter(get_trains(ORIGIN, DEST))
-    to_home = enrich_and_filter(get_trains(DEST, ORIGIN))
+    # Fetch both directions and both typical-commute windows concurrently (I/O bound)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        to_city_f = pool.submit(get_trains, ORIGIN, DEST, strict=strict)
+        to_home_f = pool.submit(get_trains, DEST, ORIGIN, strict=strict)
+        morning_raw_f = pool.submit(fetch_station_window, ORIGIN, before=60, after=720, limit=500, strict=strict)
+        evening_raw_f = pool.submit(fetch_station_window, DEST, before=60, after=720, limit=500, strict=strict)
+
+    # One clock read per render, shared by every filter below
+    now_utc = datetime.now(timezone.utc)
+    now_hki = now_utc.astimezone(TZ)
+
+    to_city = enrich_and_filter(to_city_f.result(), now_utc)
+    to_home = enrich_and_filter(to_home_f.result(), now_utc)
 
     origin_name = STATIONS.get(ORIGIN, ORIGIN)
     dest_name   = STATIONS.get(DEST, DEST)
-    active_left, active_right = active_direction_now()
+    active_left, active_right = active_direction_now(now_hki)
 
     html = StringIO()
 
@@ -192,6 +187,19 @@ def render_trains_html():
         .train-columns > div {
             min-width: 0;
         }
+        .train-row {
+            margin-bottom: 4px;
+        }
+        .train-details {
+            font-size: 13px;
+            opacity: 0.8;
+        }
+        .next-train-box {
+            background-color: #e9e9e9;
+            border-radius: 4px;
+            padding: 1px 6px;
+            display: inline-block;
+        }
         @media (max-width: 520px) {
             .train-columns {
                 gap: 12px;
@@ -206,39 +214,33 @@ def render_trains_html():
     html.write("<h3>Next trains</h3>")
     html.write("<div class='train-columns'>")
 
-    # Left column (to city)
-    html.write("<div>")
-    html.write(f"<h4>{origin_name} → {dest_name}</h4>")
-    if not to_city:
-        html.write("<p><i>No upcoming trains.</i></p>")
-    else:
-        for i, (sc, num, text, best_dt, plat, rows, mins) in enumerate(to_city):
-            html.write(
-                format_row(
-                    dest_name, num, text, plat, mins,
-                    show_details=(i == 0),
-                    highlight_bg=(i == 0 and active_left),
-                    bold_only=(i == 0 and not active_left)
-                )
+    # Each column is built as one string and written once
+    html.write(column_html(
+        f"{origin_name} → {dest_name}",
+        "".join(
+            format_row(
+                dest_name, num, text, plat, mins,
+                show_details=(i == 0),
+                highlight_bg=(i == 0 and active_left),
+                bold_only=(i == 0 and not active_left)
             )
-    html.write("</div>")  # end left column
-
-    # Right column (to home)
-    html.write("<div>")
-    html.write(f"<h4>{dest_name} → {origin_name}</h4>")
-    if not to_home:
-        html.write("<p><i>No upcoming trains.</i></p>")
-    else:
-        for i, (sc, num, text, best_dt, plat, rows, mins) in enumerate(to_home):
-            html.write(
-                format_row(
-                    origin_name, num, text, plat, mins,
-                    show_details=(i == 0),
-                    highlight_bg=(i == 0 and active_right),
-                    bold_only=(i == 0 and not active_right)
-                )
+            for i, (sc, num, text, best_dt, plat, rows, mins) in enumerate(to_city)
+        ),
+        "No upcoming trains.",
+    ))
+    html.write(column_html(
+        f"{dest_name} → {origin_name}",
+        "".join(
+            format_row(
+                origin_name, num, text, plat, mins,
+                show_details=(i == 0),
+                highlight_bg=(i == 0 and active_right),
+                bold_only=(i == 0 and not active_right)
             )
-    html.write("</div>")  # end right column
+            for i, (sc, num, text, best_dt, plat, rows, mins) in enumerate(to_home)
+        ),
+        "No upcoming trains.",
+    ))
     html.write("</div>")  # end current trains section
 
     # --- HORIZONTAL SEPARATOR ---
@@ -247,10 +249,9 @@ def render_trains_html():
     # --- SECTION 2: TYPICAL COMMUTE TRAINS ---
     html.write("<h3>Typical commute trains</h3>")
     
-    # Fetch typical commute trains with extended window
-    from trains import fetch_station_window
-    morning_trains_raw = fetch_station_window(ORIGIN, before=60, after=720, limit=500)
-    evening_trains_raw = fetch_station_window(DEST, before=60, after=720, limit=500)
+    # Typical commute trains use the extended windows fetched above
+    morning_trains_raw = morning_raw_f.result()
+    evening_trains_raw = evening_raw_f.result()
     
     # Process through get_trains logic
     from trains import TRAIN_LINE as cfg_line
@@ -262,9 +263,8 @@ def render_trains_html():
             if tr.get("commuterLineID") != cfg_line:
                 continue
             rows = tr["timeTableRows"]
-            dep = next((r for r in rows if r["stationShortCode"] == origin_code and r["type"] == "DEPARTURE"), None)
-            arr = next((r for r in rows if r["stationShortCode"] == dest_code and r["type"] == "ARRIVAL"), None)
-            if not dep or not arr or rows.index(dep) >= rows.index(arr):
+            dep = find_route_departure(rows, origin_code, dest_code)
+            if dep is None:
                 continue
             
             from trains import parse_time, extract_best_time
@@ -278,36 +278,30 @@ def render_trains_html():
     evening_trains = process_trains_for_route(evening_trains_raw, DEST, ORIGIN)
     
     # Filter by time (07:00 and 15:00)
-    morning_filtered = filter_by_time(morning_trains, 7, 0)
-    evening_filtered = filter_by_time(evening_trains, 15, 0)
+    morning_filtered = filter_by_time(morning_trains, 7, 0, now_hki)
+    evening_filtered = filter_by_time(evening_trains, 15, 0, now_hki)
     
     html.write("<div class='train-columns'>")
     
-    # Left: Morning commute (07:00)
-    html.write("<div>")
-    html.write(f"<h4 style='margin-top:0;'>{origin_name} → {dest_name}</h4>")
-    if not morning_filtered:
-        html.write("<p><i>No trains found.</i></p>")
-    else:
-        for sched_time, num, text, best_dt, plat, rows in morning_filtered:
-            html.write("<div style='margin-bottom:4px;'>")
-            html.write(f"To {dest_name} ({TRAIN_LINE} {num}) — {text}")
-            html.write(f"<br><span style='font-size:13px; opacity:0.8;'>Platform {plat}</span>")
-            html.write("</div>")
-    html.write("</div>")
-    
-    # Right: Evening commute (15:00)
-    html.write("<div>")
-    html.write(f"<h4 style='margin-top:0;'>{dest_name} → {origin_name}</h4>")
-    if not evening_filtered:
-        html.write("<p><i>No trains found.</i></p>")
-    else:
-        for sched_time, num, text, best_dt, plat, rows in evening_filtered:
-            html.write("<div style='margin-bottom:4px;'>")
-            html.write(f"To {origin_name} ({TRAIN_LINE} {num}) — {text}")
-            html.write(f"<br><span style='font-size:13px; opacity:0.8;'>Platform {plat}</span>")
-            html.write("</div>")
-    html.write("</div>")
+    # Left: Morning commute (07:00), right: evening commute (15:00)
+    html.write(column_html(
+        f"{origin_name} → {dest_name}",
+        "".join(
+            format_row(dest_name, num, text, plat, show_details=True)
+            for sched_time, num, text, best_dt, plat, rows in morning_filtered
+        ),
+        "No trains found.",
+        heading_style=" style='margin-top:0;'",
+    ))
+    html.write(column_html(
+        f"{dest_name} → {origin_name}",
+        "".join(
+            format_row(origin_name, num, text, plat, show_details=True)
+            for sched_time, num, text, best_dt, plat, rows in evening_filtered
+        ),
+        "No trains found.",
+        heading_style=" style='margin-top:0;'",
+    ))
     
     html.write("</div>")  # end typical commute section
 
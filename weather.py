@@ -13,11 +13,11 @@ Usage examples:
 
 import argparse
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import math
 from typing import Dict, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
-import requests
 import xml.etree.ElementTree as ET
 
 try:
@@ -32,6 +32,8 @@ except ImportError:  # pragma: no cover - fallback for versions without AstralEr
 
 from astral.sun import sun
 
+from http_utils import get_session, ttl_cache
+
 # -----------------------------------
 # DEFAULT CONFIGURATION
 # -----------------------------------
@@ -41,6 +43,10 @@ try:
     DEFAULT_TIMEZONE = ZoneInfo("Europe/Helsinki")
 except Exception:  # pragma: no cover - fallback for systems without timezone database
     DEFAULT_TIMEZONE = datetime.timezone.utc
+# Pooled keep-alive session shared with trains/roads
+_SESSION = get_session()
+# HARMONIE runs update hourly; reuse a parameter/place forecast for this long
+FORECAST_CACHE_SECONDS = 600
 STORED_QUERY = "fmi::forecast::harmonie::surface::point::timevaluepair"
 STEP_MIN = 60
 
@@ -53,6 +59,9 @@ _PARAMETER_MAP = {
     "weather_symbol3": "WeatherSymbol3",
 }
 
+# Parameters fetched (in parallel) for interval_forecast, in unpacking order
+_INTERVAL_PARAMETERS = ("precipitation_amount", "temperature", "windspeedms", "weather_symbol3")
+
 ICON_BASE_URL = "https://cdn.fmi.fi/symbol-images/smartsymbol/v3/p"
 
 # Descriptions copied from FMI SmartSymbol documentation so wording matches the
@@ -198,9 +207,16 @@ def set_config(place=None, forecast_hours=None):
 def _fetch_forecast(parameter: str, *, place: Optional[str] = None,
                     forecast_hours: Optional[int] = None):
     """Fetch forecast values from FMI Open Data using the 'timevaluepair' query."""
+    # Resolve config defaults first so the cache key reflects the effective query
+    return _fetch_forecast_cached(
+        parameter, place or _config["place"], forecast_hours or _config["forecast_hours"]
+    )
+
+
+@ttl_cache(FORECAST_CACHE_SECONDS, cache_if=lambda result: result[2] is None)
+def _fetch_forecast_cached(parameter: str, place: str, forecast_hours: int):
+    """Uncached FMI forecast query behind _fetch_forecast (errors are not cached)."""
     now = datetime.datetime.now(datetime.UTC)
-    place = place or _config["place"]
-    forecast_hours = forecast_hours or _config["forecast_hours"]
     starttime = now.strftime("%Y-%m-%dT%H:%M:%SZ")
     endtime = (now + datetime.timedelta(hours=forecast_hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -216,7 +232,7 @@ def _fetch_forecast(parameter: str, *, place: Optional[str] = None,
     )
 
     try:
-        r = requests.get(url, timeout=20)
+        r = _SESSION.get(url, timeout=20)
         r.raise_for_status()
     except Exception as e:
         return [], None, f"❌ Failed to fetch FMI forecast: {e}"
@@ -274,7 +290,7 @@ def _fetch_observations(parameter: str, *, place: Optional[str] = None,
             f"&endtime={endtime}"
         )
         try:
-            r = requests.get(url, timeout=20)
+            r = _SESSION.get(url, timeout=20)
             r.raise_for_status()
             return r.content
         except Exception:
@@ -318,8 +334,11 @@ def get_temperature_series(place: str, hours_past: int = 24, hours_future: int =
     Get a combined series of temperature observations and forecasts.
     Returns: List of (datetime, temperature_c)
     """
-    obs, _, err_obs = _fetch_observations("temperature", place=place, hours_past=hours_past)
-    forecasts, _, err_forecast = _fetch_forecast("temperature", place=place, forecast_hours=hours_future)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        obs_f = pool.submit(_fetch_observations, "temperature", place=place, hours_past=hours_past)
+        fc_f = pool.submit(_fetch_forecast, "temperature", place=place, forecast_hours=hours_future)
+    obs, _, err_obs = obs_f.result()
+    forecasts, _, err_forecast = fc_f.result()
     
     # Combine and sort
     combined = []
@@ -465,26 +484,16 @@ def interval_forecast(place: str, *, start_hour: int = 8, total_hours: int = 24,
 
     try:
         padding = max(forecast_hours, total_hours + 4)
-        precip, location, err = _fetch_forecast(
-            "precipitation_amount", place=place, forecast_hours=padding
-        )
-        if err:
-            return None, err
-        temps, loc2, err = _fetch_forecast(
-            "temperature", place=place, forecast_hours=padding
-        )
-        if err:
-            return None, err
-        winds, loc3, err = _fetch_forecast(
-            "windspeedms", place=place, forecast_hours=padding
-        )
-        if err:
-            return None, err
-        symbols, loc4, err = _fetch_forecast(
-            "weather_symbol3", place=place, forecast_hours=padding
-        )
-        if err:
-            return None, err
+        # The four parameter queries are independent FMI round-trips; run them together
+        with ThreadPoolExecutor(max_workers=len(_INTERVAL_PARAMETERS)) as pool:
+            fetched = list(pool.map(
+                lambda param: _fetch_forecast(param, place=place, forecast_hours=padding),
+                _INTERVAL_PARAMETERS,
+            ))
+        for _, _, err in fetched:
+            if err:
+                return None, err
+        (precip, location, _), (temps, loc2, _), (winds, loc3, _), (symbols, loc4, _) = fetched
     except Exception as e:
         return None, f"❌ Failed to fetch forecast: {e}"
 